@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the per row reverse() done by ShowChangeList.url_for_result before
+url templates with the current implementation, at several page sizes.
+
+    python -m benchmarks.changelist_urls
+"""
+from benchmarks import harness
+
+PAGE_SIZES = (100, 500, 1000)
+
+
+def main():
+    harness.setup()
+
+    from django.contrib.admin.utils import quote
+    from django.contrib.auth.models import User
+    from django.core.urlresolvers import reverse
+    from django.test import RequestFactory
+
+    from benchmarks.urls import site
+
+    model_admin = site._registry[User]
+    client = harness.get_superuser_client()
+    User.objects.bulk_create([
+        User(username='user%d' % i, email='user%d@example.com' % i)
+        for i in range(max(PAGE_SIZES))])
+
+    ChangeList = model_admin.get_changelist(None)
+
+    class ReverseChangeList(ChangeList):
+        def url_for_result(self, result):
+            pk = getattr(result, self.pk_attname)
+            return reverse('admin:%s_%s_show' % (self.opts.app_label, self.opts.model_name),
+                           args=(quote(pk),), current_app=self.model_admin.admin_site.name)
+
+    def get_changelist(changelist_class, page_size):
+        request = RequestFactory().get('/admin/auth/user/')
+        request.user = User.objects.get(username='benchmark')
+        return changelist_class(
+            request, User, model_admin.list_display, model_admin.list_display_links,
+            model_admin.list_filter, model_admin.date_hierarchy, model_admin.search_fields,
+            model_admin.list_select_related, page_size, model_admin.list_max_show_all,
+            model_admin.list_editable, model_admin)
+
+    rows = []
+    for page_size in PAGE_SIZES:
+        model_admin.list_per_page = page_size
+        timings = []
+        for changelist_class in (ReverseChangeList, ChangeList):
+            changelist = get_changelist(changelist_class, page_size)
+            results = list(changelist.result_list)
+            timings.append(harness.measure(
+                lambda: [changelist.url_for_result(result) for result in results]))
+        page = harness.measure(lambda: client.get('/admin/auth/user/'), repeat=5)
+        rows.append((page_size, timings[0], timings[1], timings[0] / max(timings[1], 1e-6), page))
+
+    harness.report(
+        'ShowChangeList row urls (median ms per page)',
+        ('rows', 'reverse per row', 'url template', 'speedup', 'changelist page'),
+        rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers shared by the benchmark scripts. They run against an in-memory
+SQLite database, e.g.:
+
+    python -m benchmarks.run
+    python -m benchmarks.changelist_urls
+"""
+import gc
+import json
+import math
+import os
+import time
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+
+def setup():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    call_command('migrate', verbosity=0, interactive=False)
+
+
+def get_superuser_client():
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    user = User.objects.filter(is_superuser=True).first()
+    if user is None:
+        user = User.objects.create_superuser('benchmark', 'benchmark@example.com', 'benchmark')
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def measure_timings(func, repeat=10):
+    """
+    Calls func repeat times and returns the sorted wall times in ms.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        timings.append((time.time() - start) * 1000)
+    timings.sort()
+    return timings
+
+
+def percentile(timings, percent):
+    """
+    Returns the nearest-rank percentile of sorted timings.
+    """
+    index = int(math.ceil(percent / 100.0 * len(timings))) - 1
+    return timings[min(max(index, 0), len(timings) - 1)]
+
+
+def measure(func, repeat=10):
+    """
+    Calls func repeat times and returns the median wall time in ms.
+    """
+    timings = measure_timings(func, repeat)
+    return timings[len(timings) // 2]
+
+
+def count_queries(func):
+    """
+    Calls func once and returns the number of SQL queries it ran.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    return len(queries)
+
+
+def measure_memory(func):
+    """
+    Calls func once and returns the peak memory it allocated in KiB, or,
+    without tracemalloc, the number of objects it left alive.
+    """
+    gc.collect()
+    if tracemalloc is not None:
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1] / 1024.0
+        finally:
+            tracemalloc.stop()
+    before = len(gc.get_objects())
+    func()
+    return len(gc.get_objects()) - before
+
+
+def report(title, header, rows):
+    print(title)
+    print(' | '.join(header))
+    for row in rows:
+        print(' | '.join(
+            '%.2f' % value if isinstance(value, float) else str(value) for value in row))
+    print('')
+
+
+def load_baseline(path):
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as baseline_file:
+        json.dump(results, baseline_file, indent=2, separators=(',', ': '), sort_keys=True)
+        baseline_file.write('\n')
+
+
+def compare(results, baseline, tolerance=0.2, min_delta=1.0):
+    """
+    Returns the regressions of results against baseline, as (case, metric,
+    baseline value, value) tuples: latencies more than tolerance and
+    min_delta ms above the baseline, memory more than tolerance above it,
+    any query added.
+    """
+    regressions = []
+    for case, metrics in sorted(results.items()):
+        baseline_metrics = baseline.get('results', {}).get(case)
+        if baseline_metrics is None:
+            continue
+        for metric, value in sorted(metrics.items()):
+            baseline_value = baseline_metrics.get(metric)
+            if baseline_value is None or value is None:
+                continue
+            if metric == 'queries':
+                regressed = value > baseline_value
+            elif metric == 'memory':
+                regressed = value > baseline_value * (1 + tolerance)
+            else:
+                regressed = (value > baseline_value * (1 + tolerance) and
+                             value - baseline_value > min_delta)
+            if regressed:
+                regressions.append((case, metric, baseline_value, value))
+    return regressions
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite of the show view, the show changelist, the show inlines
+and the betteradmin_tags filters, on synthetic models (see
+benchmarks.synthetic):
+
+    python -m benchmarks.run --fields 20 --fk-fanout 4 --inline-size 200
+    python -m benchmarks.run --save-baseline baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+
+With --baseline it exits with status 1 if a case regressed: a latency or
+memory more than --tolerance (and --min-delta ms) above the baseline, or
+more queries.
+
+benchmarks/baseline.json is the reference checked before a release. It
+holds the shape of the run (the default one), the Python and Django
+versions, and per case the p50/p90/p99 latencies in ms, the query count
+and the memory (KiB with tracemalloc, else objects left alive, so it is
+only compared on the same Python version). It was taken with Python 2.7,
+Django 1.11 and --repeat 50, which compares with less noise than the
+default. Latencies depend on the machine, so refresh it with
+--save-baseline from the release machine when they are off.
+"""
+import argparse
+import platform
+import sys
+
+from benchmarks import harness
+
+PERCENTILES = (50, 90, 99)
+
+# Calls per sample of the cases too fast to be timed one by one
+CALLS = 1000
+
+
+def get_cases(site, Item, item):
+    from django.contrib.admin import helpers
+    from django.contrib.auth.models import User
+    from django.core.urlresolvers import resolve, reverse
+    from django.test import RequestFactory
+
+    from betteradmin.admin import ShowForm
+    from betteradmin.templatetags import betteradmin_tags
+
+    client = harness.get_superuser_client()
+    model_admin = site._registry[Item]
+    show_url = reverse('admin:benchmarks_item_show', args=(item.pk,))
+    show_json_url = reverse('admin:benchmarks_item_show_json', args=(item.pk,))
+    changelist_url = reverse('admin:benchmarks_item_changelist')
+
+    request = RequestFactory().get(show_url)
+    request.user = User.objects.get(username='benchmark')
+    request.resolver_match = resolve(show_url)
+
+    fieldsets = model_admin.get_fieldsets(request, item)
+    admin_form = helpers.AdminForm(ShowForm(item, model_admin.form), fieldsets, {},
+                                   readonly_fields=helpers.flatten_fieldsets(fieldsets),
+                                   model_admin=model_admin)
+    fields = [field for fieldset in admin_form for line in fieldset for field in line]
+
+    def get_inline_instances():
+        for _ in range(CALLS):
+            model_admin.get_inline_instances(request, item)
+
+    def filter_fields():
+        for _ in range(CALLS):
+            for field in fields:
+                betteradmin_tags.is_db_field(field)
+                betteradmin_tags.is_email(field)
+                betteradmin_tags.is_url(field)
+                betteradmin_tags.is_foreign_key(field)
+
+    return [
+        ('show_view', lambda: client.get(show_url)),
+        ('show_json', lambda: client.get(show_json_url)),
+        ('changelist', lambda: client.get(changelist_url)),
+        ('get_inline_instances x%d' % CALLS, get_inline_instances),
+        ('template_filters x%d' % CALLS, filter_fields),
+    ]
+
+
+def run_case(func, repeat):
+    func()  # Warm up caches and lazy imports
+    timings = harness.measure_timings(func, repeat)
+    metrics = dict(('p%d' % percent, harness.percentile(timings, percent))
+                   for percent in PERCENTILES)
+    metrics['queries'] = harness.count_queries(func)
+    metrics['memory'] = harness.measure_memory(func)
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks of betteradmin.')
+    parser.add_argument('--fields', type=int, default=10,
+                        help='value fields of the synthetic model')
+    parser.add_argument('--fk-fanout', type=int, default=2,
+                        help='foreign keys of the synthetic model')
+    parser.add_argument('--inline-size', type=int, default=50,
+                        help='rows of the show view inline')
+    parser.add_argument('--changelist-size', type=int, default=100,
+                        help='rows of the changelist page')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--case', action='append', help='only run these cases')
+    parser.add_argument('--baseline', help='compare with this baseline file')
+    parser.add_argument('--save-baseline', help='store the results in this file')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='relative increase reported as a regression')
+    parser.add_argument('--min-delta', type=float, default=1.0,
+                        help='latency increase in ms below which there is no regression')
+    args = parser.parse_args(argv)
+
+    harness.setup()
+
+    import django
+    from benchmarks import synthetic
+    from benchmarks.urls import site
+
+    shape = synthetic.Shape(args.fields, args.fk_fanout, args.inline_size, args.changelist_size)
+    Item, item = synthetic.setup(site, shape)
+
+    results = {}
+    for name, func in get_cases(site, Item, item):
+        if args.case and name not in args.case:
+            continue
+        results[name] = run_case(func, args.repeat)
+
+    harness.report(
+        'betteradmin benchmarks %s (ms)' % ', '.join(
+            '%s=%s' % item for item in sorted(shape.as_dict().items())),
+        ('case',) + tuple('p%d' % percent for percent in PERCENTILES) + ('queries', 'memory'),
+        [(name,) + tuple(results[name][key] for key in sorted(results[name])
+                         if key.startswith('p')) +
+         (results[name]['queries'], results[name]['memory'])
+         for name in sorted(results)])
+
+    run = {
+        'shape': shape.as_dict(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'results': results,
+    }
+    if args.save_baseline:
+        harness.save_baseline(args.save_baseline, run)
+
+    if args.baseline:
+        baseline = harness.load_baseline(args.baseline)
+        if baseline.get('shape') != run['shape']:
+            print('Baseline was run with another shape, not comparing.')
+            return 0
+        if baseline.get('python') != run['python']:
+            # Memory is measured differently without tracemalloc
+            for metrics in baseline['results'].values():
+                metrics.pop('memory', None)
+        regressions = harness.compare(results, baseline, args.tolerance, args.min_delta)
+        for case, metric, baseline_value, value in regressions:
+            print('REGRESSION %s %s: %s -> %s' % (case, metric, baseline_value, value))
+        if regressions:
+            return 1
+        print('No regression against %s' % args.baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
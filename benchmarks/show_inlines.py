@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Compares rendering show view inlines from helpers.InlineAdminFormSet, as
+before show inline rows, with ShowInlineRowSet, at several row counts.
+
+    python -m benchmarks.show_inlines
+
+Memory is the peak allocated KiB with tracemalloc (Python 3), else the
+count of objects kept alive by the rendering.
+"""
+from benchmarks import harness
+
+ROW_COUNTS = (100, 500)
+
+
+def main():
+    harness.setup()
+
+    from django.contrib.auth.models import Group, User
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory
+
+    from benchmarks.urls import MembershipInline, site
+
+    model_admin = site._registry[Group]
+    client = harness.get_superuser_client()
+    request = RequestFactory().get('/admin/auth/group/')
+    request.user = User.objects.get(username='benchmark')
+    inline = model_admin.get_show_inline_class(MembershipInline)(Group, site)
+    User.objects.bulk_create([User(username='user%d' % i) for i in range(max(ROW_COUNTS))])
+
+    def render_formset(group):
+        FormSet = inline.get_formset(request, group)
+        queryset = model_admin.get_show_inline_queryset(request, inline, group)
+        formset = FormSet(instance=group, queryset=queryset)
+        inline_admin_formset = model_admin.get_show_inline_formsets(
+            request, [formset], [inline], group)[0]
+        return render_to_string(inline.template, {
+            'inline_admin_formset': inline_admin_formset}, request=request)
+
+    def render_rowset(group):
+        rowset = model_admin.get_show_inline_rowset(request, inline, group)
+        return render_to_string(rowset.template, {'inline_admin_formset': rowset},
+                                request=request)
+
+    rows = []
+    for row_count in ROW_COUNTS:
+        group = Group.objects.create(name='group%d' % row_count)
+        group.user_set.add(*User.objects.exclude(username='benchmark')[:row_count])
+        timings = [harness.measure(lambda: render(group), repeat=5)
+                   for render in (render_formset, render_rowset)]
+        memory = [harness.measure_memory(lambda: render(group))
+                  for render in (render_formset, render_rowset)]
+        page = harness.measure(lambda: client.get('/admin/auth/group/%d/show/' % group.pk), repeat=5)
+        rows.append((row_count, timings[0], timings[1], timings[0] / max(timings[1], 1e-6),
+                     memory[0], memory[1], page))
+
+    harness.report(
+        'Show inline rendering (median ms, memory)',
+        ('rows', 'formset', 'rows', 'speedup', 'formset memory', 'rows memory', 'show page'),
+        rows)
+
+
+if __name__ == '__main__':
+    main()
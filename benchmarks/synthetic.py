@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic models for the benchmark suite, built at run time with a
+configurable shape and registered in the benchmarks admin site:
+
+- Target, referenced by the foreign keys of Item
+- Item, with ``fields`` value fields and ``fk_fanout`` foreign keys
+- Child, shown as an inline of Item
+"""
+from django.contrib import admin
+from django.db import connection, models
+
+from betteradmin.admin import BetterModelAdmin
+
+VALUE_FIELDS = (
+    ('char', lambda: models.CharField(max_length=100), lambda i: 'value %d' % i),
+    ('text', lambda: models.TextField(), lambda i: 'text %d\n' % i * 20),
+    ('number', lambda: models.IntegerField(), lambda i: i),
+    ('email', lambda: models.EmailField(), lambda i: 'item%d@example.com' % i),
+    ('url', lambda: models.URLField(), lambda i: 'http://example.com/%d/' % i),
+)
+
+
+class Shape(object):
+
+    def __init__(self, fields=10, fk_fanout=2, inline_size=50, changelist_size=100):
+        self.fields = fields
+        self.fk_fanout = fk_fanout
+        self.inline_size = inline_size
+        self.changelist_size = changelist_size
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def create_model(name, attrs):
+    attrs = dict(attrs, __module__='benchmarks.models')
+    attrs['Meta'] = type('Meta', (object,), {'app_label': 'benchmarks'})
+    return type(str(name), (models.Model,), attrs)
+
+
+def get_value_fields(shape):
+    for i in range(shape.fields):
+        kind, make_field, make_value = VALUE_FIELDS[i % len(VALUE_FIELDS)]
+        yield '%s_%d' % (kind, i), make_field, make_value
+
+
+def build_models(shape):
+    """
+    Creates the tables of the synthetic models and returns them as a
+    (Target, Item, Child) tuple.
+    """
+    Target = create_model('Target', {
+        'name': models.CharField(max_length=100),
+        '__str__': lambda self: self.name,
+    })
+    item_attrs = dict((name, make_field()) for name, make_field, _ in get_value_fields(shape))
+    for i in range(shape.fk_fanout):
+        item_attrs['target_%d' % i] = models.ForeignKey(
+            Target, related_name='+', on_delete=models.CASCADE)
+    Item = create_model('Item', item_attrs)
+    Child = create_model('Child', {
+        'item': models.ForeignKey(Item, on_delete=models.CASCADE),
+        'name': models.CharField(max_length=100),
+        'target': models.ForeignKey(Target, related_name='+', on_delete=models.CASCADE),
+        'position': models.IntegerField(),
+    })
+
+    with connection.schema_editor() as schema_editor:
+        for model in (Target, Item, Child):
+            schema_editor.create_model(model)
+    return Target, Item, Child
+
+
+def populate(shape, Target, Item, Child):
+    """
+    Creates changelist_size items, each target of their foreign keys, and
+    inline_size children of the first item. Returns the first item.
+    """
+    targets = Target.objects.bulk_create(
+        [Target(name='target %d' % i) for i in range(max(shape.fk_fanout, 1) * 10)])
+    targets = list(Target.objects.order_by('pk'))
+    value_fields = list(get_value_fields(shape))
+
+    items = []
+    for i in range(shape.changelist_size):
+        item = Item(**dict((name, make_value(i)) for name, _, make_value in value_fields))
+        for j in range(shape.fk_fanout):
+            setattr(item, 'target_%d' % j, targets[(i + j) % len(targets)])
+        items.append(item)
+    Item.objects.bulk_create(items)
+
+    item = Item.objects.order_by('pk').first()
+    Child.objects.bulk_create([
+        Child(item=item, name='child %d' % i, target=targets[i % len(targets)], position=i)
+        for i in range(shape.inline_size)])
+    return item
+
+
+def register(site, shape, Target, Item, Child):
+    """
+    Registers the synthetic models in site and rebuilds the benchmarks
+    URLconf to include them.
+    """
+    from django.core.urlresolvers import clear_url_caches
+    from benchmarks import urls
+
+    value_fields = [name for name, _, _ in get_value_fields(shape)]
+    fk_fields = ['target_%d' % i for i in range(shape.fk_fanout)]
+
+    class ChildInline(admin.TabularInline):
+        model = Child
+        fields = ['name', 'target', 'position']
+
+    class ItemAdmin(BetterModelAdmin):
+        list_display = value_fields[:5] + fk_fields
+        list_per_page = shape.changelist_size
+        inlines = [ChildInline]
+        use_show_json = True
+
+    site.register(Target, BetterModelAdmin)
+    site.register(Item, ItemAdmin)
+    urls.urlpatterns = urls.get_urlpatterns()
+    clear_url_caches()
+
+
+def setup(site, shape):
+    """
+    Builds, registers and populates the synthetic models. Returns the
+    (Item, first item) tuple.
+    """
+    Target, Item, Child = build_models(shape)
+    register(site, shape, Target, Item, Child)
+    return Item, populate(shape, Target, Item, Child)
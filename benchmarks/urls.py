@@ -0,0 +1,33 @@
+from django.conf.urls import url
+from django.contrib import admin
+from django.contrib.auth.models import Group, User
+
+from betteradmin.admin import BetterAdminSite, BetterModelAdmin
+
+site = BetterAdminSite(name='admin')
+
+
+class UserShowAdmin(BetterModelAdmin):
+    list_display = ['username', 'email', 'is_staff']
+
+
+class MembershipInline(admin.TabularInline):
+    model = User.groups.through
+
+
+class GroupShowAdmin(BetterModelAdmin):
+    inlines = [MembershipInline]
+
+
+site.register(User, UserShowAdmin)
+site.register(Group, GroupShowAdmin)
+
+
+# Rebuilt by benchmarks.synthetic once its models are registered
+def get_urlpatterns():
+    return [
+        url(r'^admin/', site.urls),
+    ]
+
+
+urlpatterns = get_urlpatterns()
@@ -1,33 +1,475 @@
 # -*- coding: utf-8 -*-
 from django import forms
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.admin.templatetags.admin_static import static
 from django.contrib.admin import helpers
 from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
 from django.contrib.admin.views.main import ChangeList
-from django.contrib.admin.options import IS_POPUP_VAR, get_content_type_for_model, InlineModelAdmin
+from django.contrib.admin.options import (
+    IS_POPUP_VAR, IncorrectLookupParameters, InlineModelAdmin)
 from django.contrib.admin.utils import quote, unquote, flatten_fieldsets
 from django.contrib.auth import get_permission_codename
 from django.contrib.auth.admin import GroupAdmin, UserAdmin
 from django.contrib.auth.models import Group, User
-from django.db import models
-from django.http import Http404, HttpResponseRedirect
-from django.core.exceptions import PermissionDenied
-from django.core.urlresolvers import reverse
-from django.utils.translation import ugettext as _
-from django.utils.encoding import force_unicode, force_text
+from django.db import connections, models, router
+from django.db.models import Count
+from django.db.models.base import ModelBase
+from django.db.models.constants import LOOKUP_SEP
+from django.http import (
+    Http404, HttpResponseNotModified, HttpResponseRedirect, JsonResponse, StreamingHttpResponse)
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied, ValidationError
+from django.core.urlresolvers import get_script_prefix, get_urlconf, reverse
+from django.core.signals import setting_changed
+from django.utils.translation import ugettext as _, ugettext_lazy
+from django.utils.encoding import force_unicode, force_text, python_2_unicode_compatible
 from django.utils.html import escape
+from django.utils.text import capfirst
+from django.utils.http import (
+    RFC3986_SUBDELIMS, http_date, parse_etags, parse_http_date_safe, quote_etag, urlencode,
+    urlquote)
+from django.utils.functional import cached_property
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils import six, translation
 from django.template.response import TemplateResponse
 from django.core.exceptions import FieldError
 from django.views.generic import RedirectView
-from django.forms.models import modelform_factory
+from django.forms.models import modelform_factory, _get_foreign_key
+from django.forms.utils import ErrorList
 from django.conf import settings
-
+from django.core.cache import caches
+
+from betteradmin.cache import (
+    ShowFragment, connect_show_fragment_invalidation, get_show_generation, show_template_cache)
+from betteradmin.export import (
+    EXPORT_FORMATS, EXPORTERS, ExportChangeListMixin, ExportJSONEncoder, get_export_name,
+    get_export_value)
+from betteradmin.inlines import (
+    ShowInlineColumn, ShowInlineRowSet, can_load_concurrently, load_concurrently)
+from betteradmin.showlog import get_default_show_log_backend
+from betteradmin.signals import show_view_timed
+from betteradmin.timing import NullShowViewTimer, ShowViewTimer, format_server_timing
+
+from calendar import timegm
 from functools import partial, update_wrapper
-from collections import OrderedDict
+import base64
+import hashlib
+import json
+import logging
+from collections import OrderedDict, namedtuple
+from itertools import chain
 
 SHOW = 4
 
+logger = logging.getLogger('betteradmin')
+
+ShowFieldInfo = namedtuple('ShowFieldInfo', [
+    'name', 'kind', 'is_email', 'is_url', 'is_foreign_key',
+    'related_model', 'is_registered', 'show_url_name', 'attname', 'to_field'])
+
+
+def build_field_index(admin_site, model):
+    """
+    Returns a dict of field name to ShowFieldInfo for every field of
+    ``model``, with the flags the show templates need already resolved
+    against ``admin_site``.
+    """
+    index = {}
+    for db_field in model._meta.get_fields():
+        related_model = db_field.related_model
+        is_registered = bool(related_model) and admin_site.is_registered(related_model)
+        if is_registered:
+            related_opts = related_model._meta
+            show_url_name = '%s:%s_%s_show' % (
+                admin_site.name, related_opts.app_label, related_opts.model_name)
+        else:
+            show_url_name = None
+        # Raw value of forward foreign keys, and the related field it
+        # matches when it is not the pk
+        attname, to_field = None, None
+        if db_field.concrete and (db_field.many_to_one or db_field.one_to_one):
+            attname = db_field.attname
+            if not db_field.target_field.primary_key:
+                to_field = db_field.target_field.name
+        # Not every entry is a Field, e.g. GenericForeignKey
+        get_internal_type = getattr(db_field, 'get_internal_type', None)
+        index[db_field.name] = ShowFieldInfo(
+            name=db_field.name,
+            kind=get_internal_type() if get_internal_type is not None else None,
+            is_email=isinstance(db_field, models.EmailField),
+            is_url=isinstance(db_field, models.URLField),
+            is_foreign_key=isinstance(db_field, (models.ForeignKey, models.OneToOneRel)),
+            related_model=related_model,
+            is_registered=is_registered,
+            show_url_name=show_url_name,
+            attname=attname,
+            to_field=to_field,
+        )
+    return index
+
+
+def get_field_info(admin_site, model, name):
+    """
+    Returns the ShowFieldInfo for field ``name`` of ``model``, or None if it
+    is not a model field. Uses the index kept by BetterAdminSite when
+    available.
+    """
+    if isinstance(admin_site, BetterAdminSite):
+        index = admin_site.get_field_index(model)
+    else:
+        index = build_field_index(admin_site, model)
+    return index.get(name)
+
+
+def get_related_objects(obj, field_infos):
+    """
+    Returns a dict of field name to the object related to obj through the
+    foreign keys of field_infos. Relations already loaded (select_related)
+    are read from obj, the others are fetched with a query per related model
+    instead of one per field.
+    """
+    related_objects = {}
+    lookups = {}
+    for field_info in field_infos:
+        if field_info.attname is None:
+            continue
+        db_field = obj._meta.get_field(field_info.name)
+        value = getattr(obj, field_info.attname)
+        if value is None:
+            related_objects[field_info.name] = None
+        elif hasattr(obj, db_field.get_cache_name()):
+            related_objects[field_info.name] = getattr(obj, db_field.get_cache_name())
+        else:
+            key = field_info.related_model, field_info.to_field or 'pk'
+            lookups.setdefault(key, {})[field_info.name] = value
+
+    for (related_model, to_field), values in lookups.items():
+        related = related_model._base_manager.filter(
+            **{'%s__in' % to_field: set(values.values())})
+        attname = related_model._meta.get_field(to_field).attname if to_field != 'pk' else 'pk'
+        by_value = dict((getattr(instance, attname), instance) for instance in related)
+        for name, value in values.items():
+            related_objects[name] = by_value.get(value)
+    return related_objects
+
+
+def get_cached_permission(model_admin, request, permission, obj, check):
+    """
+    Returns check(), memoized on request by admin class, model, permission
+    and obj pk, unless model_admin.use_permission_cache is False.
+    """
+    if not getattr(model_admin, 'use_permission_cache', False):
+        return check()
+    cache = request.__dict__.setdefault('_betteradmin_permissions', {})
+    # The same admin class, e.g. BetterModelAdmin, can serve several models.
+    # Instances are not used, inline ones are created at every call
+    key = (model_admin.__class__, model_admin.model, permission,
+           None if obj is None else obj.pk)
+    if key not in cache:
+        cache[key] = check()
+    return cache[key]
+
+
+# Templates of betteradmin/fields rendering related lists, by style
+SHOW_RELATED_STYLES = (
+    'related', 'related_nolink', 'related_list', 'related_list_rows',
+    'related_list_rows_nolink',
+)
+
+
+@python_2_unicode_compatible
+class ShowRelatedItem(object):
+    """
+    An object of a related list, with the url of its show view.
+    """
+
+    def __init__(self, obj, show_url=None):
+        self.obj = obj
+        self.pk = obj.pk
+        self.show_url = show_url
+
+    def __str__(self):
+        return force_text(self.obj)
+
+
+# Stands for the quoted pk in url templates
+PK_PLACEHOLDER = '__betteradmin_pk__'
+
+_url_templates = {}
+
+
+def get_url_template(url_name, current_app=None):
+    """
+    Returns the url of url_name for an object with PK_PLACEHOLDER as pk.
+    Each url name is reversed once per URLconf and script prefix.
+    """
+    key = (url_name, current_app, get_urlconf(), get_script_prefix())
+    url_template = _url_templates.get(key)
+    if url_template is None:
+        url_template = reverse(url_name, args=(PK_PLACEHOLDER,), current_app=current_app)
+        _url_templates[key] = url_template
+    return url_template
+
+
+def format_url_template(url_template, pk):
+    """
+    Fills an url template from get_url_template with pk, quoted the same way
+    reverse would do.
+    """
+    if isinstance(pk, six.integer_types):
+        quoted_pk = str(pk)
+    else:
+        quoted_pk = urlquote(force_text(quote(pk)), safe=RFC3986_SUBDELIMS + str('/~:@'))
+    return url_template.replace(PK_PLACEHOLDER, quoted_pk)
+
+
+def clear_url_templates(**kwargs):
+    if kwargs.get('setting') == 'ROOT_URLCONF':
+        _url_templates.clear()
+
+
+setting_changed.connect(clear_url_templates)
+
+
+# Changelist cursor of keyset pagination
+CURSOR_VAR = 'cursor'
+
+
+def get_keyset(opts, ordering):
+    """
+    Returns the ordering as a list of (field, descending) pairs usable for
+    keyset pagination, ending with the first unique field. Returns None if
+    the ordering can not be used: expressions, lookups through relations,
+    nullable fields or no unique field.
+    """
+    keyset = []
+    for order_field in ordering:
+        if not isinstance(order_field, six.string_types) or order_field == '?':
+            return None
+        descending = order_field.startswith('-')
+        name = order_field.lstrip('-')
+        try:
+            db_field = opts.pk if name == 'pk' else opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not db_field.concrete or db_field.is_relation or db_field.null:
+            return None
+        keyset.append((db_field, descending))
+        if db_field.unique:
+            return keyset
+    return None
+
+
+def get_keyset_filter(keyset, values, forward=True):
+    """
+    Returns a Q object selecting the rows after (or before, if not forward)
+    the row with the given keyset values.
+    """
+    condition = models.Q()
+    for index, (db_field, descending) in enumerate(keyset):
+        lookups = dict((keyset[i][0].name, values[i]) for i in range(index))
+        lookups['%s__%s' % (db_field.name, 'gt' if descending != forward else 'lt')] = values[index]
+        condition |= models.Q(**lookups)
+    return condition
+
+
+def iterate_keyset(queryset, keyset, chunk_size):
+    """
+    Iterates over queryset, ordered by keyset, fetching chunk_size rows per
+    query so that memory use does not depend on the number of rows.
+    """
+    values = None
+    while True:
+        chunk = queryset
+        if values is not None:
+            chunk = chunk.filter(get_keyset_filter(keyset, values))
+        rows = list(chunk[:chunk_size])
+        for row in rows:
+            yield row
+        if len(rows) < chunk_size:
+            return
+        values = [getattr(rows[-1], db_field.attname) for db_field, descending in keyset]
+
+
+def encode_cursor(keyset, row, forward=True):
+    values = [db_field.value_to_string(row) for db_field, descending in keyset]
+    data = json.dumps({'f': forward, 'v': values}).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def decode_cursor(keyset, cursor):
+    """
+    Returns the (forward, values) tuple stored in cursor, raising ValueError
+    if it is not valid for keyset.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(str(cursor)).decode('utf-8'))
+        values = data['v']
+        forward = data['f']
+    except (TypeError, KeyError, UnicodeDecodeError) as e:
+        raise ValueError(e)
+    if not isinstance(forward, bool) or not isinstance(values, list):
+        raise ValueError('Malformed cursor.')
+    if len(values) != len(keyset):
+        raise ValueError('Cursor does not match the changelist ordering.')
+    try:
+        values = [db_field.to_python(value)
+                  for (db_field, descending), value in zip(keyset, values)]
+    except ValidationError as e:
+        raise ValueError(e)
+    # Keyset fields are not nullable, and None can not be compared to
+    if any(value is None for value in values):
+        raise ValueError('Malformed cursor.')
+    return forward, values
+
+
+def get_model_fields(model_admin, request, obj=None, exclude=()):
+    """
+    Returns the fields a ModelForm built by model_admin.get_form would get,
+    followed by its readonly_fields, without building the form.
+    """
+    form_opts = getattr(model_admin.form, '_meta', None)
+    form_fields = getattr(form_opts, 'fields', None)
+    if form_fields == forms.ALL_FIELDS:
+        form_fields = None
+    if model_admin.exclude is None:
+        excluded = list(getattr(form_opts, 'exclude', None) or [])
+    else:
+        excluded = list(model_admin.exclude)
+    excluded.extend(exclude)
+    readonly_fields = list(model_admin.get_readonly_fields(request, obj))
+    excluded.extend(readonly_fields)
+
+    opts = model_admin.model._meta
+    fields = []
+    for db_field in sorted(chain(opts.concrete_fields, opts.many_to_many)):
+        if not db_field.editable or isinstance(db_field, models.AutoField):
+            continue
+        if getattr(db_field.remote_field, 'parent_link', False):
+            continue
+        if form_fields is not None and db_field.name not in form_fields:
+            continue
+        if db_field.name in excluded:
+            continue
+        fields.append(db_field.name)
+    if form_fields is not None:
+        # fields_for_model follows the order of Meta.fields
+        fields = [name for name in form_fields if name in fields]
+    return fields + readonly_fields
+
+
+def get_related_lookups(model, field_names, exclude=()):
+    """
+    Plans the relations to load along with instances of ``model`` when
+    ``field_names`` are displayed.
+
+    Returns a (select_related, prefetch_related) tuple of lookups: forward
+    ForeignKey/OneToOne and reverse OneToOne relations can be joined,
+    many-valued and generic relations are prefetched. Names that are not
+    model fields (callables, admin methods) are ignored.
+    """
+    opts = model._meta
+    select_related = []
+    prefetch_related = []
+    for name in field_names:
+        if callable(name) or name in exclude:
+            continue
+        try:
+            db_field = opts.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if not db_field.is_relation:
+            continue
+        if db_field.many_to_many or db_field.one_to_many:
+            prefetch_related.append(name)
+        elif db_field.concrete or db_field.one_to_one:
+            select_related.append(name)
+        else:
+            # GenericForeignKey can not be joined
+            prefetch_related.append(name)
+    return select_related, prefetch_related
+
+
+def get_list_display_lookups(model_admin, list_display):
+    """
+    Returns the lookups read to display list_display: its model fields, and
+    the admin_lookups declared by its callables, admin and model methods,
+    e.g. ``author_country.admin_lookups = ['author__country__name']``.
+
+    The second item of the returned tuple is False when an entry does not
+    declare the fields it reads.
+    """
+    opts = model_admin.model._meta
+    lookups = []
+    complete = True
+    for name in list_display:
+        if name == 'action_checkbox':
+            continue
+        if callable(name):
+            attr = name
+        else:
+            try:
+                opts.get_field(name)
+            except FieldDoesNotExist:
+                attr = getattr(model_admin, name, None)
+                if attr is None:
+                    attr = getattr(model_admin.model, name, None)
+                if isinstance(attr, property):
+                    attr = attr.fget
+            else:
+                lookups.append(name)
+                continue
+        declared = getattr(attr, 'admin_lookups', None)
+        if declared is None:
+            complete = False
+        else:
+            lookups.extend(declared)
+    return lookups, complete
+
+
+def get_lookups_plan(model, lookups):
+    """
+    Plans the loading of instances of ``model`` when ``lookups``, field paths
+    joined by __, are read.
+
+    Returns a (fields, select_related, prefetch_related) tuple: the columns
+    of model read, the relations that can be joined, up to the first
+    many-valued or generic one, and the relations to prefetch from there.
+    """
+    fields = []
+    select_related = []
+    prefetch_related = []
+    for lookup in lookups:
+        opts = model._meta
+        relations = []
+        for name in lookup.split(LOOKUP_SEP):
+            db_field = opts.get_field(name)
+            if not relations:
+                if hasattr(db_field, 'ct_field'):
+                    # GenericForeignKey
+                    fields.extend([db_field.ct_field, db_field.fk_field])
+                elif db_field.concrete and not db_field.many_to_many:
+                    fields.append(name)
+            if not db_field.is_relation:
+                break
+            relations.append(db_field)
+            if db_field.related_model is None:
+                break
+            opts = db_field.related_model._meta
+
+        joined = []
+        for db_field in relations:
+            if db_field.many_to_many or db_field.one_to_many or db_field.related_model is None:
+                break
+            joined.append(db_field.name)
+        if joined:
+            select_related.append(LOOKUP_SEP.join(joined))
+        if len(joined) < len(relations):
+            prefetch_related.append(LOOKUP_SEP.join(db_field.name for db_field in relations))
+
+    def unique(names):
+        return list(OrderedDict.fromkeys(names))
+    return unique(fields), unique(select_related), unique(prefetch_related)
+
 
 class ShowAction(object):
     BEFORE = 'before'
@@ -74,6 +516,40 @@ class ShowActionsMixin(object):
         return self.show_actions
 
 
+class ShowFormOptions(object):
+    """
+    Minimal replacement for ModelFormOptions, exposing only what the admin
+    readonly helpers read from ``form._meta``.
+    """
+
+    def __init__(self, model, form_class=None):
+        form_opts = getattr(form_class, '_meta', None)
+        self.model = model
+        self.labels = getattr(form_opts, 'labels', None)
+        self.help_texts = getattr(form_opts, 'help_texts', None)
+
+
+class ShowForm(object):
+    """
+    Display-only stand-in for the ModelForm wrapped by helpers.AdminForm.
+
+    On the show view every field is readonly, so the admin helpers only need
+    the instance and a few Meta options. Using this object avoids building
+    form fields, widgets and choice querysets that would never be rendered.
+    """
+    is_bound = False
+    media = forms.Media()
+
+    def __init__(self, instance, form_class=None):
+        self.instance = instance
+        self.fields = {}
+        self.errors = {}
+        self._meta = ShowFormOptions(instance.__class__, form_class)
+
+    def non_field_errors(self):
+        return ErrorList()
+
+
 class ShowModelAdminMixin(ShowActionsMixin):
 
     """
@@ -84,9 +560,86 @@ class ShowModelAdminMixin(ShowActionsMixin):
     use_show_view = True
     use_show_view_log = False
 
+    # Memoize the permission checks for the duration of a request
+    use_permission_cache = True
+    show_log_backend = None
+
+    # Rows rendered per show inline, further ones are loaded on demand.
+    # Inlines can override it with their own show_page_size
+    show_inline_page_size = None
+
+    # Evaluate the querysets of the show inlines in up to show_inline_workers
+    # threads. An inline not loaded within show_inline_timeout seconds is
+    # loaded again sequentially, see can_load_show_inlines_concurrently
+    use_concurrent_inlines = False
+    show_inline_workers = 4
+    show_inline_timeout = 5
+
+    # Conditional GET (ETag/Last-Modified) on show view, see get_show_version
+    use_show_view_conditional = False
+    show_last_modified_field = None
+    show_version_field = None
+
+    # Cache of the rendered fieldsets and inlines of show view, see
+    # get_show_fragment_key and get_show_fragment_invalidators
+    use_show_fragment_cache = False
+    show_fragment_cache_alias = 'default'
+    show_fragment_cache_timeout = 300
+
+    # Load only the displayed columns of the show view object. Deferred
+    # fields are left out and rendered on demand, see get_show_deferred_fields
+    show_load_only_displayed = False
+    show_deferred_fields = ()
+    show_defer_collapsed = False
+
+    # Server-Timing header and show_view_timed signal with the duration and
+    # query count of each phase of show view
+    use_show_view_timing = False
+
+    # Keyset (cursor) pagination of the changelist, for large tables.
+    # keyset_pagination_count is None (no count), 'estimate' or 'exact'
+    use_keyset_pagination = False
+    keyset_pagination_count = None
+
+    # "Show selected" changelist action, rendering up to show_batch_max
+    # objects on one page
+    use_show_batch = False
+    show_batch_max = 50
+
+    # Streaming CSV/JSON Lines export of the filtered changelist
+    use_changelist_export = False
+    export_chunk_size = 2000
+
+    # Load the relations of the changelist rows planned from list_display,
+    # see get_changelist_lookups, and only its columns if
+    # changelist_load_only_displayed is set. With DEBUG, a changelist page
+    # running more than changelist_query_budget queries logs a warning
+    use_changelist_join_planning = False
+    changelist_load_only_displayed = False
+    changelist_query_budget = 20
+
+    # <pk>/show.json, the show view values without forms nor templates, and
+    # a JSON Lines stream of all the rows of each show inline
+    use_show_json = False
+
+    # Objects rendered by the show_related tag before a "show all" link,
+    # and the relations rendered with it. Those are not prefetched with the
+    # show object, as the tag only loads its first show_related_limit rows
+    show_related_limit = 20
+    show_related_fields = ()
+
     show_object_template = None
+    # Cache the template resolved from get_show_object_template
+    use_show_template_cache = True
     change_form_template = 'betteradmin/change_form.html'
 
+    def __init__(self, model, admin_site):
+        super(ShowModelAdminMixin, self).__init__(model, admin_site)
+        # Connected on registration rather than with the URLconf, which
+        # processes like workers or management commands never build
+        if self.use_show_fragment_cache:
+            connect_show_fragment_invalidation(self)
+
     """
         Override generic ChangeList to link to show views instead of change
     """
@@ -97,12 +650,239 @@ class ShowModelAdminMixin(ShowActionsMixin):
 
         """ChangeList with support for model 'view' page"""
 
+        @cached_property
+        def show_url_template(self):
+            return get_url_template('admin:%s_%s_show' % (self.opts.app_label,
+                                                          self.opts.model_name),
+                                    current_app=self.model_admin.admin_site.name)
+
         def url_for_result(self, result):
             pk = getattr(result, self.pk_attname)
-            return reverse('admin:%s_%s_show' % (self.opts.app_label,
-                                                   self.opts.model_name),
-                           args=(quote(pk),),
-                           current_app=self.model_admin.admin_site.name)
+            return format_url_template(self.show_url_template, pk)
+
+        def get_queryset(self, request):
+            # The cursor is not a lookup, and must not stick to other links
+            self.cursor = self.params.pop(CURSOR_VAR, None)
+            queryset = super(ShowModelAdminMixin.ShowChangeList, self).get_queryset(request)
+            if self.model_admin.use_changelist_join_planning:
+                queryset = self.apply_planned_lookups(queryset)
+            return queryset
+
+        @cached_property
+        def planned_lookups(self):
+            return self.model_admin.get_changelist_lookups(self.list_display)
+
+        def apply_select_related(self, qs):
+            if not self.model_admin.use_changelist_join_planning or self.list_select_related is True:
+                return super(ShowModelAdminMixin.ShowChangeList, self).apply_select_related(qs)
+            select_related = list(self.list_select_related or ()) + self.planned_lookups[1]
+            if select_related:
+                return qs.select_related(*select_related)
+            return qs
+
+        def apply_planned_lookups(self, qs):
+            only, select_related, prefetch_related = self.planned_lookups
+            if prefetch_related:
+                qs = qs.prefetch_related(*prefetch_related)
+            if only is not None:
+                # Joined relations and ordering columns must be loaded too
+                only = list(only)
+                if isinstance(qs.query.select_related, dict):
+                    only.extend(qs.query.select_related)
+                columns = set(field.name for field in self.lookup_opts.concrete_fields)
+                for name in qs.query.order_by:
+                    if isinstance(name, six.string_types) and name.lstrip('-') in columns:
+                        only.append(name.lstrip('-'))
+                qs = qs.only(*only)
+            return qs
+
+        def get_results(self, request):
+            self.keyset = None
+            if self.model_admin.use_keyset_pagination and not self.list_editable:
+                self.keyset = get_keyset(self.lookup_opts, self.queryset.query.order_by)
+            if self.keyset is None:
+                self.next_cursor = self.previous_cursor = None
+                return super(ShowModelAdminMixin.ShowChangeList, self).get_results(request)
+
+            queryset = self.queryset
+            forward = True
+            if self.cursor:
+                try:
+                    forward, values = decode_cursor(self.keyset, self.cursor)
+                except ValueError:
+                    raise IncorrectLookupParameters
+                queryset = queryset.filter(get_keyset_filter(self.keyset, values, forward))
+            if not forward:
+                queryset = queryset.reverse()
+
+            result_list = list(queryset[:self.list_per_page + 1])
+            has_more = len(result_list) > self.list_per_page
+            result_list = result_list[:self.list_per_page]
+            if not forward:
+                result_list.reverse()
+
+            if forward:
+                has_next, has_previous = has_more, bool(self.cursor)
+            else:
+                has_next, has_previous = True, has_more
+            self.next_cursor = has_next and encode_cursor(self.keyset, result_list[-1])
+            self.previous_cursor = has_previous and encode_cursor(
+                self.keyset, result_list[0], forward=False)
+
+            result_count = self.model_admin.get_keyset_result_count(request, self.queryset)
+            self.result_count_is_exact = result_count is not None and (
+                self.model_admin.keyset_pagination_count == 'exact')
+            if result_count is None:
+                result_count = len(result_list)
+
+            self.result_count = result_count
+            self.full_result_count = None
+            self.show_full_result_count = False
+            self.show_admin_actions = True
+            self.result_list = result_list
+            self.can_show_all = False
+            self.multi_page = has_next or has_previous
+            self.paginator = None
+
+        @property
+        def is_keyset_paginated(self):
+            return self.keyset is not None
+
+        def get_next_url(self):
+            if self.next_cursor:
+                return self.get_query_string({CURSOR_VAR: self.next_cursor})
+
+        def get_previous_url(self):
+            if self.previous_cursor:
+                return self.get_query_string({CURSOR_VAR: self.previous_cursor})
+
+    def get_changelist_lookups(self, list_display):
+        """
+        Returns the (only, select_related, prefetch_related) lookups of the
+        changelist rows, planned from list_display and the admin_lookups of
+        its callables (see get_list_display_lookups). only is None unless
+        changelist_load_only_displayed is set and every entry of
+        list_display declares the fields it reads.
+        """
+        lookups, complete = get_list_display_lookups(self, list_display)
+        fields, select_related, prefetch_related = get_lookups_plan(self.model, lookups)
+        only = fields if self.changelist_load_only_displayed and complete else None
+        return only, select_related, prefetch_related
+
+    def changelist_view(self, request, extra_context=None):
+        check_budget = settings.DEBUG and self.changelist_query_budget is not None
+        if check_budget:
+            connection = connections[router.db_for_read(self.model)]
+            start = len(connection.queries_log)
+        response = super(ShowModelAdminMixin, self).changelist_view(request, extra_context)
+        if isinstance(response, TemplateResponse):
+            self.update_changelist_response(response)
+        if not check_budget:
+            return response
+
+        def check_query_budget(response):
+            # Counted once rendered, as the rows are displayed by the template
+            count = len(connection.queries_log) - start
+            if count > self.changelist_query_budget:
+                logger.warning(
+                    '%s changelist ran %d queries, over its budget of %d. Declare the '
+                    'relations read by list_display callables in their admin_lookups.',
+                    self.model._meta.label, count, self.changelist_query_budget)
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(check_query_budget)
+        return response
+
+    def update_changelist_response(self, response):
+        """
+        Renders the changelist with betteradmin/change_list.html only when
+        keyset pagination or the export is used, so that otherwise the
+        admin/<app>/<model>/change_list.html overrides still apply. Hides
+        the selection across pages when the row count is not exact.
+        """
+        cl = response.context_data.get('cl')
+        if cl is None:
+            # Confirmation page of an action
+            return
+        if self.change_list_template is None and (
+                self.use_keyset_pagination or self.use_changelist_export):
+            response.template_name = 'betteradmin/change_list.html'
+        if getattr(cl, 'is_keyset_paginated', False) and not cl.result_count_is_exact:
+            response.context_data['actions_selection_counter'] = False
+
+    def get_keyset_result_count(self, request, queryset):
+        """
+        Returns the number of rows of a keyset paginated changelist according
+        to keyset_pagination_count, or None if not counted. Estimates are
+        only available on PostgreSQL for unfiltered changelists.
+        """
+        if self.keyset_pagination_count == 'exact':
+            return queryset.count()
+        if self.keyset_pagination_count == 'estimate' and not queryset.query.where:
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s',
+                                   [self.model._meta.db_table])
+                    row = cursor.fetchone()
+                if row and row[0] >= 0:
+                    return int(row[0])
+        return None
+
+    def get_export_changelist(self, request):
+        """
+        Returns the ChangeList class of export_view: the one of
+        get_changelist, not loading any page of results.
+        """
+        ChangeList = self.get_changelist(request)
+        return type(str('Export%s' % ChangeList.__name__),
+                    (ExportChangeListMixin, ChangeList), {})
+
+    def get_export_rows(self, request, cl):
+        """
+        Yields (object, absolute show url) pairs for the rows of cl, in
+        chunks of export_chunk_size when the ordering allows keyset
+        iteration, else through a single iterator().
+        """
+        queryset = cl.queryset
+        keyset = get_keyset(cl.lookup_opts, queryset.query.order_by)
+        if keyset is None:
+            rows = queryset.iterator()
+        else:
+            rows = iterate_keyset(queryset, keyset, self.export_chunk_size)
+        for row in rows:
+            yield row, request.build_absolute_uri(cl.url_for_result(row))
+
+    def export_view(self, request, export_format):
+        """
+        Streams the changelist rows matching the filters, search and
+        ordering of the query string, with the list_display columns.
+        """
+        if not self.use_changelist_export or export_format not in EXPORTERS:
+            raise Http404
+        if not self.has_change_permission(request, None):
+            raise PermissionDenied
+
+        # Same columns as changelist_view, for the ordering indexes to match
+        list_display = self.get_list_display(request)
+        if self.get_actions(request):
+            list_display = ['action_checkbox'] + list(list_display)
+        ChangeList = self.get_export_changelist(request)
+        try:
+            cl = ChangeList(
+                request, self.model, list_display,
+                self.get_list_display_links(request, list_display),
+                self.get_list_filter(request), self.date_hierarchy,
+                self.get_search_fields(request), self.get_list_select_related(request),
+                self.list_per_page, self.list_max_show_all, (), self)
+        except IncorrectLookupParameters:
+            raise Http404
+
+        fields = [field for field in list_display if field != 'action_checkbox']
+        content = EXPORTERS[export_format](self, fields, self.get_export_rows(request, cl))
+        response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+        response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (
+            self.model._meta.model_name, export_format)
+        return response
 
     def get_urls(self):
         from django.conf.urls import url
@@ -113,15 +893,33 @@ class ShowModelAdminMixin(ShowActionsMixin):
             if pattern.regex.pattern == '^(.+)/$':
                 urlpatterns.remove(pattern)
 
-        def wrap(view):
+        def wrap(view, cacheable=False):
             def wrapper(*args, **kwargs):
-                return self.admin_site.admin_view(view)(*args, **kwargs)
+                return self.admin_site.admin_view(view, cacheable)(*args, **kwargs)
             wrapper.model_admin = self
             return update_wrapper(wrapper, view)
 
+        # Build the show inline classes up front instead of on first request
+        for inline_class in self.inlines:
+            self.get_show_inline_class(inline_class)
+
         info = self.model._meta.app_label, self.model._meta.model_name
         urlpatterns = [
-            url(r'^(.+)/show/$', wrap(self.admin_site.admin_view(self.show_view)), name='%s_%s_show' % info),
+            url(r'^show/$', wrap(self.show_batch_view), name='%s_%s_show_batch' % info),
+            url(r'^export/(%s)/$' % '|'.join(EXPORT_FORMATS), wrap(self.export_view),
+                name='%s_%s_export' % info),
+            # Conditional responses need the show view to be cacheable
+            url(r'^(.+)/show/$', wrap(self.show_view, cacheable=self.use_show_view_conditional),
+                name='%s_%s_show' % info),
+            url(r'^(.+)/show/inlines/(\d+)/$', wrap(self.show_inline_view),
+                name='%s_%s_show_inline' % info),
+            url(r'^(.+)/show\.json$', wrap(self.show_json_view), name='%s_%s_show_json' % info),
+            url(r'^(.+)/show/inlines/(\d+)\.jsonl$', wrap(self.show_json_inline_view),
+                name='%s_%s_show_json_inline' % info),
+            url(r'^(.+)/show/field/(\w+)/$', wrap(self.show_field_view),
+                name='%s_%s_show_field' % info),
+            url(r'^(.+)/show/related/(\w+)/$', wrap(self.show_related_view),
+                name='%s_%s_show_related' % info),
         ] + urlpatterns + [
             url(r'^(.+)/$', wrap(RedirectView.as_view(
                 pattern_name='%s:%s_%s_show' % ((self.admin_site.name,) + info)
@@ -130,20 +928,51 @@ class ShowModelAdminMixin(ShowActionsMixin):
 
         return urlpatterns
 
-    def is_show_view(self, request):
+    def get_show_url_names(self):
+        """
+        Returns the names of the urls rendering the show view or a part of it.
+        """
         info = self.model._meta.app_label, self.model._meta.model_name
-        url_name = request.resolver_match.url_name
-        return url_name == '%s_%s_show' % info
+        return (
+            '%s_%s_show' % info,
+            '%s_%s_show_inline' % info,
+            '%s_%s_show_json' % info,
+            '%s_%s_show_json_inline' % info,
+            '%s_%s_show_field' % info,
+            '%s_%s_show_related' % info,
+            '%s_%s_show_batch' % info,
+        )
+
+    def is_show_view(self, request):
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is None:
+            return False
+        return resolver_match.url_name in self.get_show_url_names()
+
+    def get_show_inline_class(self, inline_class):
+        """
+        Returns the ShowInlineModelAdmin version of inline_class. Classes are
+        built once per admin and inline class, and reused on every request.
+        """
+        try:
+            show_inline_classes = self._show_inline_classes
+        except AttributeError:
+            show_inline_classes = self._show_inline_classes = {}
+        show_inline_class = show_inline_classes.get(inline_class)
+        if show_inline_class is None:
+            show_inline_class = type(
+                'Show' + inline_class.__name__,
+                (ShowInlineModelAdmin, inline_class),
+                {'base_inline_class': inline_class})
+            show_inline_classes[inline_class] = show_inline_class
+        return show_inline_class
 
     def get_inline_instances(self, request, obj=None):
         inline_instances = []
+        is_show_view = self.is_show_view(request)
         for inline_class in self.inlines:
-            # TODO Find a better way to check if we are on show view
-            if self.is_show_view(request):
-                inline_class = type(
-                    'Show' + inline_class.__name__,
-                    (ShowInlineModelAdmin, inline_class),
-                    {})
+            if is_show_view:
+                inline_class = self.get_show_inline_class(inline_class)
                 inline = inline_class(self.model, self.admin_site)
                 if inline.has_show_permission(request, obj):
                     inline_instances.append(inline)
@@ -161,10 +990,136 @@ class ShowModelAdminMixin(ShowActionsMixin):
         return inline_instances
 
     def has_show_permission(self, request, obj=None):
-        opts = self.opts
-        codename = get_permission_codename('show', opts)
-        change_permission = self.has_change_permission(request, obj)
-        return change_permission or request.user.has_perm("%s.%s" % (opts.app_label, codename))
+        def check():
+            opts = self.opts
+            codename = get_permission_codename('show', opts)
+            change_permission = self.has_change_permission(request, obj)
+            return change_permission or request.user.has_perm("%s.%s" % (opts.app_label, codename))
+        return get_cached_permission(self, request, 'show', obj, check)
+
+    def has_add_permission(self, request):
+        return get_cached_permission(self, request, 'add', None, partial(
+            super(ShowModelAdminMixin, self).has_add_permission, request))
+
+    def has_change_permission(self, request, obj=None):
+        return get_cached_permission(self, request, 'change', obj, partial(
+            super(ShowModelAdminMixin, self).has_change_permission, request, obj))
+
+    def has_delete_permission(self, request, obj=None):
+        return get_cached_permission(self, request, 'delete', obj, partial(
+            super(ShowModelAdminMixin, self).has_delete_permission, request, obj))
+
+    def get_fields(self, request, obj=None):
+        """
+            On show view fields are computed from the model instead of
+            the ModelForm, as no form is built there.
+        """
+        if self.is_show_view(request):
+            return self.get_show_fields(request, obj)
+        return super(ShowModelAdminMixin, self).get_fields(request, obj)
+
+    def get_show_fields(self, request, obj=None):
+        """
+        Returns the fields displayed by the show view when no fieldsets are
+        declared. Mimics the fields a ModelForm would get from get_form,
+        followed by the readonly_fields.
+        """
+        if self.fields:
+            return self.fields
+        return get_model_fields(self, request, obj)
+
+    def get_show_related_lookups(self, request):
+        """
+        Returns the (select_related, prefetch_related) lookups used to fetch
+        the show view object, planned from the fields in its fieldsets. The
+        show_related_fields are left to the show_related tag.
+        """
+        fields = flatten_fieldsets(self.get_fieldsets(request))
+        exclude = self.get_show_deferred_fields(request) + list(self.show_related_fields)
+        return get_related_lookups(self.model, fields, exclude=exclude)
+
+    def get_show_deferred_fields(self, request):
+        """
+        Returns the fields not loaded with the show view object, but through
+        show_field_view when requested: show_deferred_fields, plus the ones
+        in collapsed fieldsets if show_defer_collapsed is set.
+        """
+        deferred = list(self.show_deferred_fields)
+        if self.show_defer_collapsed:
+            opts = self.model._meta
+            for name, options in self.get_fieldsets(request):
+                if 'collapse' not in options.get('classes', ()):
+                    continue
+                for field in flatten_fieldsets([(name, options)]):
+                    if callable(field):
+                        continue
+                    try:
+                        db_field = opts.get_field(field)
+                    except FieldDoesNotExist:
+                        continue
+                    if db_field.concrete and not db_field.many_to_many:
+                        deferred.append(field)
+        return deferred
+
+    def get_show_only_fields(self, request):
+        """
+        Returns the columns loaded by the show view when
+        show_load_only_displayed is set: the displayed fields that are not
+        deferred, plus the ones read by the conditional validators.
+
+        Returns None when a displayed field is not a model field, as a
+        callable may read any of them.
+        """
+        opts = self.model._meta
+        deferred = self.get_show_deferred_fields(request)
+        fields = [name for name in (self.show_last_modified_field, self.show_version_field)
+                  if name]
+        for name in flatten_fieldsets(self.get_fieldsets(request)):
+            if callable(name):
+                return None
+            try:
+                db_field = opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if db_field.concrete and not db_field.many_to_many and name not in deferred:
+                fields.append(name)
+        return fields
+
+    def get_show_queryset(self, request):
+        """
+        Returns the queryset the show view object is fetched from, so that
+        related fields are rendered without a query per field, leaving out
+        the columns that are not displayed.
+        """
+        queryset = self.get_queryset(request)
+        select_related, prefetch_related = self.get_show_related_lookups(request)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+
+        only = self.get_show_only_fields(request) if self.show_load_only_displayed else None
+        if only is not None:
+            queryset = queryset.only(*only)
+        else:
+            deferred = self.get_show_deferred_fields(request)
+            if deferred:
+                queryset = queryset.defer(*deferred)
+        return queryset
+
+    def get_show_object(self, request, object_id, queryset=None):
+        """
+        Same as get_object but fetching from queryset, get_show_queryset by
+        default.
+        """
+        if queryset is None:
+            queryset = self.get_show_queryset(request)
+        model = queryset.model
+        try:
+            object_id = model._meta.pk.to_python(object_id)
+            return queryset.get(pk=object_id)
+        except (model.DoesNotExist, ValidationError, ValueError):
+            return None
 
     def get_show_object_template(self):
         opts = self.model._meta
@@ -181,67 +1136,292 @@ class ShowModelAdminMixin(ShowActionsMixin):
                 "betteradmin/show_object.html",
             ]
 
+    def get_show_template(self):
+        """
+        Returns the show view template among get_show_object_template, as
+        resolved by show_template_cache unless use_show_template_cache is
+        False. show_template_cache.info() gives its hits and misses.
+        """
+        if not self.use_show_template_cache:
+            return self.get_show_object_template()
+        return show_template_cache.get(self.get_show_object_template())
+
     def show_view(self, request, object_id, form_url='', extra_context=None):
-        model = self.model
-        opts = model._meta
-        obj = self.get_object(request, unquote(object_id))
+        timer = self.get_show_timer(request)
+        timer.start()
+        try:
+            response = self._show_view(request, object_id, timer, extra_context)
+        finally:
+            timer.stop()
+        if timer.enabled:
+            self.record_show_timings(request, object_id, response, timer.timings)
+        return response
+
+    def get_show_view_object(self, request, object_id, timer=None, queryset=None):
+        """
+        Returns the object of the show views, fetched from queryset
+        (get_show_queryset by default), raising PermissionDenied or Http404
+        when it can not be shown.
+        """
+        timer = timer or NullShowViewTimer()
+        with timer.phase('fetch'):
+            obj = self.get_show_object(request, unquote(object_id), queryset)
 
-        if not self.has_show_permission(request, obj):
-            raise PermissionDenied
+        with timer.phase('permission'):
+            if not self.has_show_permission(request, obj):
+                raise PermissionDenied
 
         if obj is None:
             raise Http404(_('%(name)s object with primary key %(key)r does not exist.') % {
-                'name': force_text(opts.verbose_name), 'key': escape(object_id)})
-
-        ModelForm = self.get_form(request, obj)
-        form = ModelForm(instance=obj)
-
-        all_fields = flatten_fieldsets(self.get_fieldsets(request, obj))
-        adminForm = helpers.AdminForm(
-            form,
-            list(self.get_fieldsets(request, obj)),
-            self.get_prepopulated_fields(request, obj),
-            readonly_fields=all_fields,  # All fields readonly
-            model_admin=self)
-        media = self.media + adminForm.media
+                'name': force_text(self.model._meta.verbose_name), 'key': escape(object_id)})
+        return obj
+
+    def _show_view(self, request, object_id, timer, extra_context=None):
         opts = self.model._meta
+        obj = self.get_show_view_object(request, object_id, timer)
+
+        etag, last_modified = None, None
+        if self.use_show_view_conditional:
+            with timer.phase('validators'):
+                etag, last_modified = self.get_show_validators(request, obj)
+            if self.is_show_not_modified(request, etag, last_modified):
+                with timer.phase('log'):
+                    self.log_show(request, obj)
+                return self.set_show_validators(
+                    HttpResponseNotModified(), etag, last_modified)
+
+        with timer.phase('form'):
+            # No ModelForm is built, values are read straight from the instance
+            form = ShowForm(obj, self.form)
+
+            fieldsets = list(self.get_fieldsets(request, obj))
+            all_fields = flatten_fieldsets(fieldsets)
+            adminForm = helpers.AdminForm(
+                form,
+                fieldsets,
+                {},  # Nothing to prepopulate on a readonly view
+                readonly_fields=all_fields,  # All fields readonly
+                model_admin=self)
+            media = self.media + adminForm.media
+            opts = self.model._meta
+
+        show_fragments = {}
+        if self.use_show_fragment_cache:
+            with timer.phase('fragments'):
+                show_fragments = self.get_show_fragments(request, obj, fieldsets)
+
+        with timer.phase('inlines'):
+            if 'inline_field_sets' in show_fragments and show_fragments['inline_field_sets'].is_cached:
+                # Inlines are already rendered, skip loading their rows
+                inline_formsets = []
+                for inline in self.get_inline_instances(request, obj):
+                    media = media + inline.media
+            else:
+                inline_formsets = self.get_show_inline_rowsets(request, obj)
+                for inline_formset in inline_formsets:
+                    media = media + inline_formset.media
+
+        with timer.phase('context'):
+            # Show Actions
+            show_actions = self.get_show_actions(request, obj)
+            view_on_site_url = self.get_view_on_site_url(obj)
+            context = dict(
+                self.admin_site.each_context(request),
+                show_actions=show_actions,
+                title=_(u'View {verbose_name}').format(
+                    verbose_name=force_unicode(opts.verbose_name)),
+                adminform=adminForm,
+                view_name='show',
+                object_id=object_id,
+                original=obj,
+                is_popup=(IS_POPUP_VAR in request.POST or
+                          IS_POPUP_VAR in request.GET),
+                media=media,
+                inline_admin_formsets=inline_formsets,
+                show_fragments=show_fragments,
+                show_deferred_urls=self.get_show_deferred_urls(request, obj),
+                errors=helpers.AdminErrorList(form, []),
+                app_label=opts.app_label,
+                is_show_view=True,
+                has_add_permission=self.has_add_permission(request),
+                has_change_permission=self.has_change_permission(request, obj),
+                has_delete_permission=self.has_delete_permission(request, obj),
+                has_absolute_url=view_on_site_url is not None,
+                absolute_url=view_on_site_url,
+                opts=opts,
+            )
+            context.update(extra_context or {})
+
+        with timer.phase('log'):
+            self.log_show(request, obj)
+        response = TemplateResponse(request, self.get_show_template(), context)
+        if timer.enabled:
+            # Rendered here instead of by the handler, to be timed
+            with timer.phase('render'):
+                response.render()
+        if self.use_show_view_conditional:
+            self.set_show_validators(response, etag, last_modified)
+        return response
+
+    def get_show_timer(self, request):
+        """
+        Returns the timer of the show view phases, a no-op one unless
+        use_show_view_timing is set.
+        """
+        if self.use_show_view_timing:
+            return ShowViewTimer()
+        return NullShowViewTimer()
 
-        formsets, inline_instances = self._create_formsets(request, obj, change=True)
-        inline_formsets = self.get_show_inline_formsets(request, formsets, inline_instances, obj)
-        for inline_formset in inline_formsets:
-            media = media + inline_formset.media
+    def record_show_timings(self, request, object_id, response, timings):
+        """
+        Sends the phases timings of a show view request in a Server-Timing
+        header and through the show_view_timed signal.
+        """
+        response['Server-Timing'] = format_server_timing(timings)
+        show_view_timed.send(sender=self.__class__, model_admin=self, request=request,
+                             object_id=object_id, timings=timings)
 
-        # Show Actions
-        show_actions = self.get_show_actions(request, obj)
-        view_on_site_url = self.get_view_on_site_url(obj)
-        context = dict(
-            self.admin_site.each_context(request),
-            show_actions=show_actions,
-            title=_(u'View {verbose_name}').format(
-                verbose_name=force_unicode(opts.verbose_name)),
-            adminform=adminForm,
-            view_name='show',
-            object_id=object_id,
-            original=obj,
-            is_popup=(IS_POPUP_VAR in request.POST or
-                      IS_POPUP_VAR in request.GET),
-            media=media,
-            inline_admin_formsets=inline_formsets,
-            errors=helpers.AdminErrorList(form, []),
-            app_label=opts.app_label,
-            is_show_view=True,
-            has_add_permission=self.has_add_permission(request),
-            has_change_permission=self.has_change_permission(request, obj),
-            has_delete_permission=self.has_delete_permission(request, obj),
-            has_absolute_url=view_on_site_url is not None,
-            absolute_url=view_on_site_url,
-            opts=opts,
+    def get_show_last_modified(self, request, obj):
+        """
+        Returns the last modification datetime of obj, read from
+        show_last_modified_field, or None if unknown.
+        """
+        if self.show_last_modified_field:
+            return getattr(obj, self.show_last_modified_field)
+        return None
+
+    def get_show_version(self, request, obj):
+        """
+        Returns a value that changes whenever the shown data of obj changes,
+        or None to disable conditional responses for obj.
+
+        Defaults to show_version_field, falling back to the last modification
+        date. Override it to also take inline objects into account.
+        """
+        if self.show_version_field:
+            return getattr(obj, self.show_version_field)
+        return self.get_show_last_modified(request, obj)
+
+    def get_show_permission_signature(self, request, obj):
+        """
+        Returns a tuple describing everything that depends on the user
+        permissions on the show view: object permissions, visible inlines
+        and show actions.
+        """
+        return (
+            self.has_add_permission(request),
+            self.has_change_permission(request, obj),
+            self.has_delete_permission(request, obj),
+            tuple(type(inline).__name__ for inline in self.get_inline_instances(request, obj)),
+            tuple(show_action.render(request, obj)
+                  for show_action in self.get_show_actions(request, obj)),
         )
-        context.update(extra_context or {})
 
-        self.log_show(request, obj)
-        return TemplateResponse(request, self.get_show_object_template(), context)
+    def get_show_validators(self, request, obj):
+        """
+        Returns the (etag, last_modified) validators of the show view of obj.
+        The ETag covers the permission signature, so a cached page is never
+        reused by a user with a different set of permissions.
+        """
+        version = self.get_show_version(request, obj)
+        if version is None:
+            return None, None
+
+        signature = (
+            self.model._meta.label_lower,
+            force_text(obj.pk),
+            force_text(version),
+            translation.get_language(),
+            self.get_show_permission_signature(request, obj),
+        )
+        etag = quote_etag(hashlib.md5(force_text(signature).encode('utf-8')).hexdigest())
+
+        last_modified = self.get_show_last_modified(request, obj)
+        if last_modified is not None:
+            last_modified = timegm(last_modified.utctimetuple())
+        return etag, last_modified
+
+    def is_show_not_modified(self, request, etag, last_modified):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            # If-None-Match takes precedence over If-Modified-Since
+            if etag is None:
+                return False
+            etags = parse_etags(if_none_match)
+            return '*' in etags or etag in [quote_etag(e) for e in etags]
+
+        if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since and last_modified is not None:
+            if_modified_since = parse_http_date_safe(if_modified_since)
+            return if_modified_since is not None and last_modified <= if_modified_since
+        return False
+
+    def set_show_validators(self, response, etag, last_modified):
+        if etag is not None:
+            response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Pages depend on the user, they must not be stored by shared caches
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    def get_show_fragment_key(self, request, obj, name, fieldsets):
+        """
+        Returns the cache key of the show view fragment called name.
 
+        The key changes with the object, its cache generation (bumped by
+        the invalidation signals), its version, the fieldsets layout, the
+        active language and the user permissions.
+        """
+        cache = caches[self.show_fragment_cache_alias]
+        layout = [(fieldset_name, [getattr(field, '__name__', field)
+                                   for field in flatten_fieldsets([(fieldset_name, options)])])
+                  for fieldset_name, options in fieldsets]
+        signature = (
+            get_show_generation(cache, self.model, obj.pk),
+            force_text(self.get_show_version(request, obj)),
+            layout,
+            translation.get_language(),
+            self.get_show_permission_signature(request, obj),
+        )
+        return 'betteradmin:show:%s:%s:%s:%s' % (
+            self.model._meta.label_lower, obj.pk, name,
+            hashlib.md5(force_text(signature).encode('utf-8')).hexdigest())
+
+    def get_show_fragments(self, request, obj, fieldsets):
+        """
+        Returns the ShowFragment objects of the show view blocks cached by
+        the ``show_fragment`` template tag, keyed by block name.
+        """
+        cache = caches[self.show_fragment_cache_alias]
+        keys = dict(
+            (name, self.get_show_fragment_key(request, obj, name, fieldsets))
+            for name in ('field_sets', 'inline_field_sets'))
+        cached = cache.get_many(keys.values())
+        return dict(
+            (name, ShowFragment(cache, key, self.show_fragment_cache_timeout, cached.get(key)))
+            for name, key in keys.items())
+
+    def get_show_fragment_invalidators(self):
+        """
+        Returns a dict of model to function returning the pks of the shown
+        objects whose cached fragments are invalidated when an instance of
+        that model is saved or deleted. Defaults to the model itself and the
+        models of its inlines. Auto-created many to many tables send no
+        post_save, their inlines are invalidated through m2m_changed.
+        """
+        invalidators = {self.model: lambda instance: [instance.pk]}
+        for inline_class in self.inlines:
+            fk = _get_foreign_key(self.model, inline_class.model, fk_name=inline_class.fk_name)
+            invalidators[inline_class.model] = (
+                lambda instance, attname=fk.get_attname(): [getattr(instance, attname)])
+        return invalidators
+
+    # DEPRECATED
     def get_show_inline_formsets(self, request, formsets, inline_instances, obj=None):
         inline_admin_formsets = []
         for inline, formset in zip(inline_instances, formsets):
@@ -254,6 +1434,444 @@ class ShowModelAdminMixin(ShowActionsMixin):
             inline_admin_formsets.append(inline_admin_formset)
         return inline_admin_formsets
 
+    def get_show_inline_rowsets(self, request, obj):
+        """
+        Returns a ShowInlineRowSet per inline of the show view, each with
+        the first page of its rows.
+        """
+        inlines = self.get_inline_instances(request, obj)
+        if self.use_concurrent_inlines and self.can_load_show_inlines_concurrently(inlines):
+            pages = load_concurrently(
+                [partial(self.load_show_inline_page, request, inline, obj)
+                 for inline in inlines],
+                self.show_inline_workers, self.show_inline_timeout)
+        else:
+            pages = [None] * len(inlines)
+        return [self.get_show_inline_rowset(request, inline, obj, page=page)
+                for inline, page in zip(inlines, pages)]
+
+    def can_load_show_inlines_concurrently(self, inlines):
+        """
+        Whether the rows of inlines can be loaded in worker threads. Not
+        worth it for a single inline, and not possible inside a transaction
+        (ATOMIC_REQUESTS, tests) or with an in-memory SQLite database.
+        """
+        return len(inlines) > 1 and all(
+            can_load_concurrently(router.db_for_read(inline.model)) for inline in inlines)
+
+    def load_show_inline_page(self, request, inline, obj, offset=0):
+        """
+        Same as get_show_inline_page with the rows evaluated into a list.
+        """
+        rows, total_count, next_offset = self.get_show_inline_page(request, inline, obj, offset)
+        return list(rows), total_count, next_offset
+
+    def get_show_inline_rowset(self, request, inline, obj, offset=0, page=None):
+        if page is None:
+            page = self.load_show_inline_page(request, inline, obj, offset)
+        rows, total_count, next_offset = page
+        fk = _get_foreign_key(self.model, inline.model, fk_name=inline.fk_name)
+        return ShowInlineRowSet(
+            inline, list(inline.get_fieldsets(request, obj)), rows, fk=fk,
+            total_count=total_count, offset=offset,
+            more_url=self.get_show_inline_more_url(inline, obj, next_offset))
+
+    def get_show_inline_queryset(self, request, inline, obj):
+        """
+        Returns the rows of inline related to obj.
+        """
+        fk = _get_foreign_key(self.model, inline.model, fk_name=inline.fk_name)
+        rows = inline.get_queryset(request).filter(**{fk.name: obj})
+        return self.get_show_inline_rows(request, inline, fk, rows, obj)
+
+    def get_show_inline_rows(self, request, inline, fk, rows, obj=None):
+        """
+        Orders the rows of inline. Inlines with show_original = False only
+        load the displayed columns and fk: as values() when they are all
+        plain model fields, else with only().
+        """
+        if not rows.ordered:
+            rows = rows.order_by(inline.model._meta.pk.name)
+        if getattr(inline, 'show_original', True):
+            return rows
+
+        columns = [ShowInlineColumn(field, inline)
+                   for field in flatten_fieldsets(inline.get_fieldsets(request, obj))
+                   if field != fk.name]
+        if all(column.is_plain_field for column in columns):
+            return rows.values('pk', fk.attname, *[column.db_field.attname for column in columns])
+        if all(column.db_field is not None for column in columns):
+            return rows.only(fk.name, *[column.name for column in columns
+                                        if column.db_field.concrete and
+                                        not column.db_field.many_to_many])
+        return rows
+
+    def get_show_inline_page_size(self, inline):
+        return getattr(inline, 'show_page_size', self.show_inline_page_size)
+
+    def get_show_inline_page(self, request, inline, obj, offset=0):
+        """
+        Returns a (rows, total_count, next_offset) tuple with the rows of
+        inline shown from offset. Without page size rows are all the rows
+        and total_count and next_offset are None.
+        """
+        rows = self.get_show_inline_queryset(request, inline, obj)
+        page_size = self.get_show_inline_page_size(inline)
+        if not page_size:
+            return rows, None, None
+
+        total_count = rows.count()
+        next_offset = offset + page_size
+        if next_offset >= total_count:
+            next_offset = None
+        return rows[offset:offset + page_size], total_count, next_offset
+
+    def get_show_inline_more_url(self, inline, obj, offset):
+        if offset is None:
+            return None
+        inline_index = self.inlines.index(inline.base_inline_class)
+        info = self.model._meta.app_label, self.model._meta.model_name
+        url = reverse('admin:%s_%s_show_inline' % info,
+                      args=(quote(obj.pk), inline_index),
+                      current_app=self.admin_site.name)
+        return '%s?offset=%s' % (url, offset)
+
+    def show_inline_view(self, request, object_id, inline_index):
+        """
+        Renders the rows of a paginated show inline from the offset given
+        in the query string.
+        """
+        opts = self.model._meta
+        obj, inline = self.get_show_inline_view_object(request, object_id, inline_index)
+        try:
+            offset = max(int(request.GET.get('offset', 0)), 0)
+        except ValueError:
+            offset = 0
+        context = dict(
+            self.admin_site.each_context(request),
+            inline_admin_formset=self.get_show_inline_rowset(request, inline, obj, offset),
+            original=obj,
+            opts=opts,
+            is_show_view=True,
+        )
+        return TemplateResponse(request, 'betteradmin/show_inline_page.html', context)
+
+    def get_show_inline_view_object(self, request, object_id, inline_index):
+        """
+        Returns the (object, inline instance) pair of the views rendering a
+        single show inline, raising PermissionDenied or Http404 when it can
+        not be shown.
+        """
+        obj = self.get_show_view_object(request, object_id, queryset=self.get_queryset(request))
+        try:
+            inline_class = self.inlines[int(inline_index)]
+        except IndexError:
+            raise Http404
+        inline = self.get_show_inline_class(inline_class)(self.model, self.admin_site)
+        if not inline.has_show_permission(request, obj):
+            raise PermissionDenied
+        return obj, inline
+
+    def show_json_view(self, request, object_id):
+        """
+        Returns the values displayed by show_view as JSON: the fields of the
+        fieldsets, except deferred ones given as urls, and the first page of
+        rows of each show inline.
+        """
+        if not self.use_show_json:
+            raise Http404
+        obj = self.get_show_view_object(request, object_id)
+        fieldsets = self.get_fieldsets(request, obj)
+        deferred_urls = self.get_show_deferred_urls(request, obj)
+
+        fields = OrderedDict()
+        for field in flatten_fieldsets(fieldsets):
+            name = get_export_name(field)
+            if name not in deferred_urls:
+                fields[name] = get_export_value(field, obj, self)
+
+        inlines = []
+        for rowset in self.get_show_inline_rowsets(request, obj):
+            data = rowset.get_data()
+            data['rows_url'] = self.get_show_json_inline_url(rowset.opts, obj)
+            inlines.append(data)
+
+        self.log_show(request, obj)
+        return JsonResponse(OrderedDict([
+            ('pk', obj.pk),
+            ('repr', force_text(obj)),
+            ('fields', fields),
+            ('deferred_urls', deferred_urls),
+            ('inlines', inlines),
+        ]), encoder=ExportJSONEncoder)
+
+    def get_show_json_inline_url(self, inline, obj):
+        inline_index = self.inlines.index(inline.base_inline_class)
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return reverse('admin:%s_%s_show_json_inline' % info,
+                       args=(quote(obj.pk), inline_index),
+                       current_app=self.admin_site.name)
+
+    def show_json_inline_view(self, request, object_id, inline_index):
+        """
+        Streams all the rows of a show inline as JSON Lines, for inlines too
+        large for show_json_view.
+        """
+        if not self.use_show_json:
+            raise Http404
+        obj, inline = self.get_show_inline_view_object(request, object_id, inline_index)
+        rows = self.get_show_inline_queryset(request, inline, obj)
+        fk = _get_foreign_key(self.model, inline.model, fk_name=inline.fk_name)
+        rowset = ShowInlineRowSet(
+            inline, list(inline.get_fieldsets(request, obj)), rows.iterator(), fk=fk)
+        content = (json.dumps(row.get_data(), cls=ExportJSONEncoder) + '\n' for row in rowset)
+        return StreamingHttpResponse(content, content_type=EXPORT_FORMATS['jsonl'])
+
+    def get_show_related_items(self, obj, name, style='related', limit=None):
+        """
+        Returns the context of the betteradmin/fields template of style
+        listing the objects related to obj through the many-valued relation
+        name: the first limit objects (all without limit), their total count
+        and the url of show_related_view listing them all.
+        """
+        db_field = self.model._meta.get_field(name)
+        if not (db_field.many_to_many or db_field.one_to_many):
+            raise ValueError('%s is not a many-valued relation of %s' % (name, self.model))
+        if hasattr(db_field, 'get_accessor_name'):
+            queryset = getattr(obj, db_field.get_accessor_name()).all()
+            label = db_field.related_model._meta.verbose_name_plural
+        else:
+            queryset = getattr(obj, name).all()
+            label = db_field.verbose_name
+
+        if limit is None:
+            objects = list(queryset)
+            total_count = len(objects)
+        else:
+            # One more row tells whether counting is needed at all
+            objects = list(queryset[:limit + 1])
+            total_count = len(objects)
+            if total_count > limit:
+                objects = objects[:limit]
+                total_count = queryset.count()
+
+        related_model = db_field.related_model
+        related_admin = self.admin_site._registry.get(related_model)
+        url_template = None
+        if isinstance(related_admin, ShowModelAdminMixin):
+            related_opts = related_model._meta
+            url_template = get_url_template(
+                'admin:%s_%s_show' % (related_opts.app_label, related_opts.model_name),
+                current_app=self.admin_site.name)
+        items = [ShowRelatedItem(
+            related, url_template and format_url_template(url_template, related.pk))
+            for related in objects]
+
+        show_all_url = None
+        if total_count > len(items):
+            info = self.model._meta.app_label, self.model._meta.model_name
+            show_all_url = '%s?style=%s' % (
+                reverse('admin:%s_%s_show_related' % info, args=(quote(obj.pk), name),
+                        current_app=self.admin_site.name),
+                style)
+        return {
+            'name': capfirst(label),
+            'items': items,
+            'total_count': total_count,
+            'show_all_url': show_all_url,
+            'opts': related_model._meta,
+            # Items without show url are not linked
+            'show_related': True,
+        }
+
+    def show_related_view(self, request, object_id, name):
+        """
+        Renders all the objects of a related list cut by the show_related tag.
+        """
+        fields = flatten_fieldsets(self.get_fieldsets(request)) + list(self.show_related_fields)
+        style = request.GET.get('style', 'related')
+        if name not in fields or style not in SHOW_RELATED_STYLES:
+            raise Http404
+
+        obj = self.get_show_view_object(request, object_id, queryset=self.get_queryset(request))
+        try:
+            context = self.get_show_related_items(obj, name, style)
+        except (FieldDoesNotExist, ValueError):
+            raise Http404
+        context.update(self.admin_site.each_context(request))
+        return TemplateResponse(request, 'betteradmin/fields/show_%s.html' % style, context)
+
+    def get_actions(self, request):
+        actions = super(ShowModelAdminMixin, self).get_actions(request)
+        if self.use_show_batch and self.actions is not None and IS_POPUP_VAR not in request.GET:
+            actions['show_selected'] = (
+                self.__class__.show_selected, 'show_selected',
+                self.show_selected.short_description)
+        return actions
+
+    def show_selected(self, request, queryset):
+        """
+        Action redirecting to the batch show view of the selected objects.
+        """
+        pks = list(queryset.values_list('pk', flat=True)[:self.show_batch_max + 1])
+        if len(pks) > self.show_batch_max:
+            pks = pks[:self.show_batch_max]
+            self.message_user(request, _(
+                'Only the first %(count)d selected %(verbose_name_plural)s are shown.') % {
+                    'count': self.show_batch_max,
+                    'verbose_name_plural': force_text(self.model._meta.verbose_name_plural)},
+                messages.WARNING)
+        info = self.model._meta.app_label, self.model._meta.model_name
+        url = reverse('admin:%s_%s_show_batch' % info, current_app=self.admin_site.name)
+        return HttpResponseRedirect('%s?%s' % (url, urlencode({
+            'ids': ','.join(force_text(quote(pk)) for pk in pks)})))
+    show_selected.short_description = ugettext_lazy('Show selected %(verbose_name_plural)s')
+
+    def get_show_objects(self, request, object_ids):
+        """
+        Returns the objects of object_ids found in get_show_queryset, in
+        order, fetched together.
+        """
+        pk_field = self.model._meta.pk
+        pks = []
+        for object_id in object_ids:
+            try:
+                pk = pk_field.to_python(object_id)
+            except ValidationError:
+                continue
+            if pk not in pks:
+                pks.append(pk)
+        objects = self.get_show_queryset(request).in_bulk(pks)
+        return [objects[pk] for pk in pks if pk in objects]
+
+    def get_show_batch_inline_rowsets(self, request, objects):
+        """
+        Returns a dict of pk to the ShowInlineRowSets of each object. The
+        rows of each inline are loaded for all the objects at once, except
+        for the objects with more rows than the page size of the inline,
+        whose first page is loaded on its own.
+        """
+        rowsets = dict((obj.pk, []) for obj in objects)
+        for inline in self.get_inline_instances(request):
+            fk = _get_foreign_key(self.model, inline.model, fk_name=inline.fk_name)
+            queryset = inline.get_queryset(request)
+            page_size = self.get_show_inline_page_size(inline)
+            parents = objects
+            counts = {}
+            if page_size:
+                counts = dict(queryset.filter(**{'%s__in' % fk.name: objects}).order_by()
+                              .values_list(fk.attname).annotate(Count('pk')))
+                parents = [obj for obj in objects
+                           if 0 < counts.get(getattr(obj, fk.target_field.attname), 0) <= page_size]
+
+            rows_by_parent = {}
+            if parents:
+                rows = queryset.filter(**{'%s__in' % fk.name: parents})
+                for row in self.get_show_inline_rows(request, inline, fk, rows):
+                    value = row[fk.attname] if isinstance(row, dict) else getattr(row, fk.attname)
+                    rows_by_parent.setdefault(value, []).append(row)
+
+            fieldsets = list(inline.get_fieldsets(request))
+            for obj in objects:
+                value = getattr(obj, fk.target_field.attname)
+                total_count = counts.get(value, 0) if page_size else None
+                more_url = None
+                if page_size and total_count > page_size:
+                    rows = list(self.get_show_inline_queryset(request, inline, obj)[:page_size])
+                    more_url = self.get_show_inline_more_url(inline, obj, page_size)
+                else:
+                    rows = rows_by_parent.get(value, [])
+                rowsets[obj.pk].append(ShowInlineRowSet(
+                    inline, fieldsets, rows, fk=fk, total_count=total_count, more_url=more_url))
+        return rowsets
+
+    def show_batch_view(self, request):
+        """
+        Renders the show layout of the objects whose quoted pks are given,
+        comma separated, in the ids parameter. Objects the user can not
+        show are left out.
+        """
+        opts = self.model._meta
+        object_ids = [unquote(object_id) for object_id in request.GET.get('ids', '').split(',')
+                      if object_id][:self.show_batch_max]
+        objects = self.get_show_objects(request, object_ids)
+        if not objects:
+            raise Http404
+        objects = [obj for obj in objects if self.has_show_permission(request, obj)]
+        if not objects:
+            raise PermissionDenied
+
+        inline_rowsets = self.get_show_batch_inline_rowsets(request, objects)
+        media = self.media
+        show_objects = []
+        for obj in objects:
+            fieldsets = list(self.get_fieldsets(request, obj))
+            adminForm = helpers.AdminForm(
+                ShowForm(obj, self.form),
+                fieldsets,
+                {},
+                readonly_fields=flatten_fieldsets(fieldsets),
+                model_admin=self)
+            media = media + adminForm.media
+            for rowset in inline_rowsets[obj.pk]:
+                media = media + rowset.media
+            show_objects.append({
+                'original': obj,
+                'adminform': adminForm,
+                'inline_admin_formsets': inline_rowsets[obj.pk],
+                'show_actions': self.get_show_actions(request, obj),
+                'show_deferred_urls': self.get_show_deferred_urls(request, obj),
+                'show_url': reverse('admin:%s_%s_show' % (opts.app_label, opts.model_name),
+                                    args=(quote(obj.pk),), current_app=self.admin_site.name),
+                'has_change_permission': self.has_change_permission(request, obj),
+                'has_delete_permission': self.has_delete_permission(request, obj),
+            })
+            self.log_show(request, obj)
+
+        context = dict(
+            self.admin_site.each_context(request),
+            title=_(u'View {verbose_name}').format(
+                verbose_name=force_unicode(opts.verbose_name_plural)),
+            show_objects=show_objects,
+            media=media,
+            app_label=opts.app_label,
+            is_show_view=True,
+            has_change_permission=self.has_change_permission(request),
+            opts=opts,
+        )
+        return TemplateResponse(request, 'betteradmin/show_batch.html', context)
+
+    def get_show_deferred_urls(self, request, obj):
+        """
+        Returns the url of show_field_view for each deferred field of obj.
+        """
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return dict(
+            (name, reverse('admin:%s_%s_show_field' % info, args=(quote(obj.pk), name),
+                           current_app=self.admin_site.name))
+            for name in self.get_show_deferred_fields(request))
+
+    def show_field_view(self, request, object_id, field_name):
+        """
+        Renders the value of a deferred field of the show view.
+        """
+        opts = self.model._meta
+        if field_name not in self.get_show_deferred_fields(request):
+            raise Http404
+
+        obj = self.get_show_view_object(
+            request, object_id, queryset=self.get_queryset(request).only(field_name))
+        field = helpers.AdminReadonlyField(ShowForm(obj, self.form), field_name,
+                                           is_first=True, model_admin=self)
+        context = dict(
+            self.admin_site.each_context(request),
+            field=field,
+            original=obj,
+            opts=opts,
+            is_show_view=True,
+        )
+        return TemplateResponse(request, 'betteradmin/show_field_page.html', context)
+
     # DEPRECATED
     def get_show_form(self, request, obj=None, **kwargs):
         """
@@ -310,28 +1928,60 @@ class ShowModelAdminMixin(ShowActionsMixin):
 
         The default implementation check for use_show_view_log
         If false (default) does not anything
-        If true creates an admin LogEntry object.
+        If true creates an admin LogEntry object through the show log backend.
         """
         if self.use_show_view_log:
             self._create_log_entry(request, object, SHOW)
 
     def _create_log_entry(self, request, object, action_flag):
-        from django.contrib.admin.models import LogEntry
-        LogEntry.objects.log_action(
-            user_id=request.user.pk,
-            content_type_id=get_content_type_for_model(object).pk,
-            object_id=object.pk,
-            object_repr=force_text(object),
-            action_flag=action_flag,
-        )
+        self.get_show_log_backend().log(request.user.pk, object, action_flag)
+
+    def get_show_log_backend(self):
+        """
+        Returns the backend storing show log entries: show_log_backend if
+        set, else the one configured by the BETTERADMIN_SHOW_LOG setting.
+        """
+        return self.show_log_backend or get_default_show_log_backend()
 
 
 class ShowInlineModelAdmin(object):
     extra = 0
     max_num = 0
 
+    use_permission_cache = True
+
+    # Show options read from the inline class, so not defaulted here where
+    # they would hide it:
+    # - show_original = False loads and renders rows from their displayed
+    #   values only (no model instance, so no __str__ nor model methods as
+    #   fields)
+    # - show_page_size overrides show_inline_page_size of the model admin
+    # - show_template renders the inline, by default show_tabular.html for
+    #   a TabularInline and show_stacked.html for any other inline. The
+    #   template attribute of the inline is ignored, as it renders a formset
+    # - show_rows_template renders the rows alone, for "show more"
+
+    def get_fields(self, request, obj=None):
+        """
+            Computed from the model, as show inlines build no formset.
+        """
+        if self.fields:
+            return self.fields
+        fk = _get_foreign_key(self.parent_model, self.model, fk_name=self.fk_name)
+        return get_model_fields(self, request, obj, exclude=(fk.name,))
+
     def get_queryset(self, request):
-        return super(InlineModelAdmin, self).get_queryset(request)
+        queryset = super(InlineModelAdmin, self).get_queryset(request)
+        # The parent is already loaded, only join what the rows display
+        fk = _get_foreign_key(self.parent_model, self.model, fk_name=self.fk_name)
+        fields = flatten_fieldsets(self.get_fieldsets(request))
+        select_related, prefetch_related = get_related_lookups(
+            self.model, fields, exclude=(fk.name,))
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
 
     def has_add_permission(self, request):
         return False
@@ -343,10 +1993,12 @@ class ShowInlineModelAdmin(object):
         return False
 
     def has_show_permission(self, request, obj=None):
-        opts = self.opts
-        codename = get_permission_codename('show', opts)
-        change_permission = self.has_change_permission(request, obj)
-        return change_permission or request.user.has_perm("%s.%s" % (opts.app_label, codename))
+        def check():
+            opts = self.opts
+            codename = get_permission_codename('show', opts)
+            change_permission = self.has_change_permission(request, obj)
+            return change_permission or request.user.has_perm("%s.%s" % (opts.app_label, codename))
+        return get_cached_permission(self, request, 'show', obj, check)
 
 
 # Register your models here.
@@ -399,6 +2051,10 @@ class BetterAdminSite(admin.AdminSite):
     models.
     """
 
+    def __init__(self, *args, **kwargs):
+        super(BetterAdminSite, self).__init__(*args, **kwargs)
+        self._field_index = {}
+
     def register(self, model_or_iterable, admin_class=None, **options):
         """
             Override to indicate BetterModelAdmin as base ModelAdmin class
@@ -406,6 +2062,35 @@ class BetterAdminSite(admin.AdminSite):
         if not admin_class:
             admin_class = BetterModelAdmin
         super(BetterAdminSite, self).register(model_or_iterable, admin_class=admin_class, **options)
+        self._update_field_index(model_or_iterable)
+
+    def unregister(self, model_or_iterable):
+        super(BetterAdminSite, self).unregister(model_or_iterable)
+        self._update_field_index(model_or_iterable)
+
+    def get_field_index(self, model):
+        """
+        Returns the field index of ``model``. Registered models are indexed
+        at register time, other shown models (e.g. inline ones) on first use.
+        """
+        index = self._field_index.get(model)
+        if index is None:
+            index = self._field_index[model] = build_field_index(self, model)
+        return index
+
+    def _update_field_index(self, model_or_iterable):
+        if isinstance(model_or_iterable, ModelBase):
+            model_or_iterable = [model_or_iterable]
+        changed = set(model_or_iterable)
+        for model in changed:
+            self._field_index.pop(model, None)
+        # Registration state of the related models is part of the index
+        for model, index in list(self._field_index.items()):
+            if any(info.related_model in changed for info in index.values()):
+                self._field_index[model] = build_field_index(self, model)
+        for model in changed:
+            if self.is_registered(model):
+                self._field_index[model] = build_field_index(self, model)
 
 
 site = BetterAdminSite()
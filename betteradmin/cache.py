@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+import os
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.template.loader import select_template
+from django.utils import six
+
+
+def get_generation_key(model, pk):
+    return 'betteradmin:show:%s:%s:generation' % (model._meta.label_lower, pk)
+
+
+def get_show_generation(cache, model, pk):
+    """
+    Returns the current generation of the cached show fragments of the
+    object. Fragment keys include it, so changing it invalidates them all.
+    """
+    key = get_generation_key(model, pk)
+    generation = cache.get(key)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        cache.set(key, generation, None)
+    return generation
+
+
+def invalidate_show_fragments(cache, model, pk):
+    if pk is not None:
+        cache.set(get_generation_key(model, pk), uuid.uuid4().hex, None)
+
+
+class ShowFragment(object):
+    """
+    A rendered block of the show view template, loaded from the cache or
+    stored into it by the ``show_fragment`` template tag.
+    """
+
+    def __init__(self, cache, key, timeout, content=None):
+        self.cache = cache
+        self.key = key
+        self.timeout = timeout
+        self.content = content
+
+    @property
+    def is_cached(self):
+        return self.content is not None
+
+    def save(self, content):
+        self.content = content
+        self.cache.set(self.key, content, self.timeout)
+
+
+def connect_show_fragment_invalidation(model_admin):
+    """
+    Connects the signals invalidating the fragments cached by model_admin.
+
+    get_show_fragment_invalidators gives, for each model triggering the
+    invalidation, a function returning the pks of the shown objects
+    affected by a change on one of its instances.
+    """
+    cache = caches[model_admin.show_fragment_cache_alias]
+    parent_model = model_admin.model
+    # Keyed by site and model, so that registering again replaces them
+    uid_prefix = 'betteradmin_show_fragment_%s_%s' % (
+        model_admin.admin_site.name, parent_model._meta.label_lower)
+
+    for model, get_pks in model_admin.get_show_fragment_invalidators().items():
+        def invalidate(sender, instance, get_pks=get_pks, **kwargs):
+            for pk in get_pks(instance):
+                invalidate_show_fragments(cache, parent_model, pk)
+
+        uid = '%s_%s' % (uid_prefix, model._meta.label_lower)
+        for signal in (post_save, post_delete):
+            signal.disconnect(sender=model, dispatch_uid=uid)
+            signal.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+
+    def invalidate_m2m(sender, instance, action, model, pk_set, **kwargs):
+        if not action.startswith('post_'):
+            return
+        pks = []
+        if isinstance(instance, parent_model):
+            pks.append(instance.pk)
+        if model is parent_model:
+            pks.extend(pk_set or ())
+        for pk in pks:
+            invalidate_show_fragments(cache, parent_model, pk)
+
+    for m2m_field in parent_model._meta.get_fields():
+        if not m2m_field.many_to_many:
+            continue
+        if m2m_field.concrete:
+            through = m2m_field.remote_field.through
+        else:
+            through = m2m_field.through
+        uid = '%s_%s' % (uid_prefix, through._meta.label_lower)
+        m2m_changed.disconnect(sender=through, dispatch_uid=uid)
+        m2m_changed.connect(invalidate_m2m, sender=through, weak=False, dispatch_uid=uid)
+
+
+TemplateCacheInfo = namedtuple('TemplateCacheInfo', ('hits', 'misses', 'size'))
+
+
+class ResolvedTemplateCache(object):
+    """
+    Process wide cache of the template selected among a list of candidate
+    names, so that loaders are searched once per list instead of at every
+    request.
+
+    With DEBUG, a cached template is dropped when its file changes. New
+    templates higher in the candidates are only picked up on restart, as
+    with the cached template loader.
+    """
+
+    def __init__(self):
+        self.templates = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, template_names, using=None):
+        if isinstance(template_names, six.string_types):
+            template_names = [template_names]
+        key = tuple(template_names), using
+        entry = self.templates.get(key)
+        if entry is not None:
+            template, mtime = entry
+            if not settings.DEBUG or get_template_mtime(template) == mtime:
+                self.hits += 1
+                return template
+
+        self.misses += 1
+        template = select_template(template_names, using=using)
+        self.templates[key] = template, get_template_mtime(template)
+        return template
+
+    def info(self):
+        return TemplateCacheInfo(self.hits, self.misses, len(self.templates))
+
+    def clear(self):
+        self.templates.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def get_template_mtime(template):
+    origin = getattr(template, 'origin', None)
+    try:
+        return os.path.getmtime(origin.name)
+    except (AttributeError, TypeError, OSError):
+        return None
+
+
+show_template_cache = ResolvedTemplateCache()
+
+
+def clear_show_template_cache(**kwargs):
+    if kwargs.get('setting') in ('TEMPLATES', 'DEBUG'):
+        show_template_cache.clear()
+
+
+setting_changed.connect(clear_show_template_cache)
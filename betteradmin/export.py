@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import csv
+import json
+from collections import OrderedDict
+
+from django.contrib.admin.utils import label_for_field, lookup_field
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import six
+from django.utils.encoding import force_bytes, force_text
+from django.utils.functional import Promise
+from django.utils.text import capfirst
+
+EXPORT_FORMATS = OrderedDict([
+    ('csv', 'text/csv; charset=utf-8'),
+    ('jsonl', 'application/x-ndjson; charset=utf-8'),
+])
+
+
+class ExportChangeListMixin(object):
+    """
+    Changelist only used for its filtered, searched and ordered queryset:
+    no page of results is loaded.
+    """
+
+    def get_results(self, request):
+        pass
+
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+
+    def default(self, o):
+        try:
+            return super(ExportJSONEncoder, self).default(o)
+        except TypeError:
+            return force_text(o)
+
+
+class Echo(object):
+    """
+    File-like object returning what is written, to stream csv.writer rows.
+    """
+
+    def write(self, value):
+        return value
+
+
+def get_export_value(field, obj, model_admin):
+    """
+    Returns the value of a displayed field of obj, as displayed text for
+    choices and related objects (a list of them for many to many fields),
+    as is otherwise.
+    """
+    try:
+        f, attr, value = lookup_field(field, obj, model_admin)
+    except (AttributeError, ObjectDoesNotExist):
+        return None
+    if f is not None and f.many_to_many and value is not None:
+        return [force_text(related) for related in value.all()]
+    if f is not None and f.flatchoices:
+        value = dict(f.flatchoices).get(value, value)
+    if isinstance(value, (models.Model, Promise)):
+        value = force_text(value)
+    return value
+
+
+def get_export_name(field):
+    return field.__name__ if callable(field) else field
+
+
+def export_csv(model_admin, fields, rows):
+    """
+    Yields the CSV lines of rows, an iterable of (object, show url) pairs.
+    """
+    writer = csv.writer(Echo())
+    header = [capfirst(force_text(label_for_field(field, model_admin.model, model_admin)))
+              for field in fields] + ['show_url']
+    yield writerow(writer, header)
+    for obj, show_url in rows:
+        values = [get_export_value(field, obj, model_admin) for field in fields]
+        yield writerow(writer, [
+            '' if value is None else force_text(value) for value in values] + [show_url])
+
+
+def writerow(writer, values):
+    if six.PY2:
+        # The Python 2 csv module only handles bytes
+        values = [force_bytes(value) for value in values]
+    return writer.writerow(values)
+
+
+def export_jsonl(model_admin, fields, rows):
+    """
+    Yields a JSON object per line for rows, an iterable of (object, show
+    url) pairs, keyed by list_display field name.
+    """
+    names = [get_export_name(field) for field in fields]
+    for obj, show_url in rows:
+        data = OrderedDict(
+            (name, get_export_value(field, obj, model_admin))
+            for name, field in zip(names, fields))
+        data['show_url'] = show_url
+        yield json.dumps(data, cls=ExportJSONEncoder) + '\n'
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'jsonl': export_jsonl,
+}
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+from collections import OrderedDict
+
+from django.contrib.admin import TabularInline
+from django.contrib.admin.templatetags.admin_list import _boolean_icon
+from django.contrib.admin.utils import (
+    display_for_field, flatten_fieldsets, help_text_for_field, label_for_field, lookup_field)
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db import connections
+from django.db.models.fields.related import ManyToManyRel
+from django.template.defaultfilters import linebreaksbr
+from django.utils import six
+from django.utils.encoding import force_text
+from django.utils.functional import cached_property
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+
+from betteradmin.export import get_export_value
+
+try:
+    from concurrent.futures import ThreadPoolExecutor, TimeoutError
+except ImportError:  # Python 2 without the futures backport
+    ThreadPoolExecutor = TimeoutError = None
+
+logger = logging.getLogger('betteradmin')
+
+
+def display_value(field, obj, model_admin, empty_value_display):
+    """
+    Renders the value of field for obj the same way
+    helpers.AdminReadonlyField.contents does, without needing a form.
+    """
+    try:
+        f, attr, value = lookup_field(field, obj, model_admin)
+    except (AttributeError, ValueError, ObjectDoesNotExist):
+        result_repr = empty_value_display
+    else:
+        if f is None:
+            if getattr(attr, 'boolean', False):
+                result_repr = _boolean_icon(value)
+            elif hasattr(value, '__html__'):
+                result_repr = value
+            elif getattr(attr, 'allow_tags', False):
+                result_repr = mark_safe(value)
+            else:
+                result_repr = linebreaksbr(force_text(value))
+        else:
+            if isinstance(f.remote_field, ManyToManyRel) and value is not None:
+                result_repr = ', '.join(map(six.text_type, value.all()))
+            else:
+                result_repr = display_for_field(value, f, empty_value_display)
+            result_repr = linebreaksbr(result_repr)
+    return conditional_escape(result_repr)
+
+
+class ShowInlineColumn(object):
+    """
+    A field displayed by a show inline. Label and help text are resolved
+    once for all the rows.
+    """
+
+    def __init__(self, field, inline):
+        if callable(field):
+            self.name = field.__name__ if field.__name__ != '<lambda>' else ''
+        else:
+            self.name = field
+        self.field = field
+        self.label = label_for_field(field, inline.model, inline)
+        self.help_text = help_text_for_field(self.name, inline.model)
+        try:
+            self.db_field = None if callable(field) else inline.model._meta.get_field(field)
+        except FieldDoesNotExist:
+            self.db_field = None
+
+    @property
+    def is_plain_field(self):
+        """
+        Whether the value can be rendered from a values() row.
+        """
+        return (self.db_field is not None and self.db_field.concrete and
+                not self.db_field.is_relation)
+
+
+class ShowInlineCell(object):
+
+    def __init__(self, column, contents):
+        self.column = column
+        self.contents = contents
+
+
+class ShowInlineRow(object):
+    """
+    A row of a show inline. Holds either a model instance or, for inlines
+    loaded with values(), a dict of the displayed values.
+    """
+
+    def __init__(self, rowset, row):
+        self.rowset = rowset
+        if isinstance(row, dict):
+            self.original = None
+            self.values = row
+        else:
+            self.original = row
+            self.values = None
+
+    @property
+    def pk(self):
+        return self.original.pk if self.values is None else self.values['pk']
+
+    @cached_property
+    def cells(self):
+        return [ShowInlineCell(column, self.get_contents(column))
+                for column in self.rowset.columns]
+
+    def get_contents(self, column):
+        empty_value_display = self.rowset.empty_value_display
+        if self.values is None:
+            return display_value(column.field, self.original, self.rowset.opts,
+                                 empty_value_display)
+        value = self.values[column.db_field.attname]
+        return conditional_escape(linebreaksbr(
+            display_for_field(value, column.db_field, empty_value_display)))
+
+    def get_value(self, column):
+        """
+        Returns the value of column for JSON output, as displayed text for
+        choices and related objects.
+        """
+        if self.values is None:
+            return get_export_value(column.field, self.original, self.rowset.opts)
+        value = self.values[column.db_field.attname]
+        if column.db_field.flatchoices:
+            value = dict(column.db_field.flatchoices).get(value, value)
+        return value
+
+    def get_data(self):
+        data = OrderedDict([('pk', self.pk)])
+        for column in self.rowset.columns:
+            data[column.name] = self.get_value(column)
+        return data
+
+    @property
+    def fieldsets(self):
+        cells = dict((cell.column.name, cell) for cell in self.cells)
+        for fieldset in self.rowset.get_layout():
+            yield dict(fieldset, lines=[
+                [cells[name] for name in line if name in cells]
+                for line in fieldset['lines']])
+
+
+class ShowInlineRowSet(object):
+    """
+    Show view replacement of helpers.InlineAdminFormSet. Renders the rows of
+    an inline from their values, without building any form.
+    """
+
+    def __init__(self, inline, fieldsets, rows, fk=None, total_count=None, more_url=None,
+                 offset=0):
+        self.opts = inline
+        self.fieldsets = fieldsets
+        self.rows = rows
+        self.offset = offset
+        self.show_total_count = total_count
+        self.show_more_url = more_url
+        self.show_original = getattr(inline, 'show_original', True)
+        self.classes = ' '.join(getattr(inline, 'classes', None) or ())
+        self.empty_value_display = inline.get_empty_value_display()
+        self.exclude = (fk.name,) if fk is not None else ()
+        if fk is not None:
+            self.prefix = fk.remote_field.get_accessor_name(model=inline.model).replace('+', '')
+        else:
+            self.prefix = inline.model._meta.model_name
+        self.columns = [ShowInlineColumn(field, inline)
+                        for field in flatten_fieldsets(fieldsets)
+                        if field not in self.exclude]
+
+    def __iter__(self):
+        for row in self.rows:
+            yield ShowInlineRow(self, row)
+
+    def get_data(self):
+        return OrderedDict([
+            ('name', self.prefix),
+            ('verbose_name', force_text(self.opts.verbose_name_plural)),
+            ('total_count', self.show_total_count),
+            ('rows', [row.get_data() for row in self]),
+        ])
+
+    @property
+    def is_tabular(self):
+        return isinstance(self.opts, TabularInline)
+
+    @property
+    def template(self):
+        """
+        The show_template of the inline, else the show layout of a tabular
+        or stacked inline. The template of the inline renders a formset, so
+        it is not used.
+        """
+        template = getattr(self.opts, 'show_template', None)
+        if template:
+            return template
+        if self.is_tabular:
+            return 'betteradmin/edit_inline/show_tabular.html'
+        return 'betteradmin/edit_inline/show_stacked.html'
+
+    @property
+    def rows_template(self):
+        """
+        Template of the rows alone, which "show more" appends to the
+        .show-inline-rows element of template.
+        """
+        template = getattr(self.opts, 'show_rows_template', None)
+        if template:
+            return template
+        if self.is_tabular:
+            return 'betteradmin/edit_inline/show_tabular_rows.html'
+        return 'betteradmin/edit_inline/show_stacked_rows.html'
+
+    @property
+    def media(self):
+        return self.opts.media
+
+    def get_layout(self):
+        layout = []
+        for name, options in self.fieldsets:
+            lines = []
+            for line in options.get('fields', ()):
+                if not hasattr(line, '__iter__') or isinstance(line, six.text_type):
+                    line = [line]
+                lines.append([getattr(field, '__name__', field) for field in line
+                              if field not in self.exclude])
+            layout.append({
+                'name': name,
+                'classes': ' '.join(options.get('classes', ())),
+                'description': options.get('description'),
+                'lines': lines,
+            })
+        return layout
+
+
+def can_load_concurrently(using):
+    """
+    Whether querysets of database using can be evaluated from other threads
+    with their own connection: they would not see the rows of an open
+    transaction, nor the tables of an in-memory SQLite database.
+    """
+    if ThreadPoolExecutor is None:
+        return False
+    connection = connections[using]
+    if connection.in_atomic_block:
+        return False
+    if connection.vendor != 'sqlite':
+        return True
+    # DatabaseWrapper.is_in_memory_db takes the name before Django 1.10
+    name = force_text(connection.settings_dict['NAME'])
+    return not (name == ':memory:' or 'mode=memory' in name)
+
+
+def _call_in_thread(function):
+    try:
+        return function()
+    finally:
+        # The worker thread opened its own database connections
+        connections.close_all()
+
+
+def load_concurrently(functions, workers, timeout=None):
+    """
+    Calls functions in a pool of up to workers threads and returns their
+    results in order.
+
+    Functions not done within timeout seconds of the call are called again
+    in the current thread, as are the ones that failed.
+    """
+    deadline = None if timeout is None else time.time() + timeout
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(functions))))
+    try:
+        futures = [executor.submit(_call_in_thread, function) for function in functions]
+        results = []
+        for function, future in zip(functions, futures):
+            remaining = None if deadline is None else max(0, deadline - time.time())
+            try:
+                results.append(future.result(timeout=remaining))
+                continue
+            except TimeoutError:
+                future.cancel()
+                logger.warning('%r not loaded in a thread within %s seconds', function, timeout)
+            except Exception:
+                logger.exception('%r failed in a thread', function)
+            results.append(function())
+        return results
+    finally:
+        # Do not keep the request waiting for the functions still running
+        executor.shutdown(wait=False)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.admin.options import get_content_type_for_model
+from django.core.signals import setting_changed
+from django.db import DatabaseError, connections, router, transaction
+from django.utils import timezone
+from django.utils.encoding import force_text
+from django.utils.module_loading import import_string
+
+DEFAULT_SHOW_LOG_BACKEND = 'betteradmin.showlog.SyncShowLogBackend'
+
+logger = logging.getLogger('betteradmin')
+
+
+class BaseShowLogBackend(object):
+    """
+    Stores the admin LogEntry rows written by ShowModelAdminMixin.log_show.
+    """
+
+    def log(self, user_id, object, action_flag):
+        raise NotImplementedError('Subclasses must implement log()')
+
+    def flush(self):
+        pass
+
+    def get_log_entry(self, user_id, object, action_flag, content_type_id=None):
+        from django.contrib.admin.models import LogEntry
+        if content_type_id is None:
+            content_type_id = get_content_type_for_model(object).pk
+        return LogEntry(
+            action_time=timezone.now(),
+            user_id=user_id,
+            content_type_id=content_type_id,
+            object_id=force_text(object.pk),
+            object_repr=force_text(object)[:200],
+            action_flag=action_flag,
+            change_message='',
+        )
+
+
+class SyncShowLogBackend(BaseShowLogBackend):
+    """
+    Writes every entry inside the request. Default backend, also the one to
+    use in tests.
+    """
+
+    def log(self, user_id, object, action_flag):
+        self.get_log_entry(user_id, object, action_flag).save()
+
+
+class BufferedShowLogBackend(BaseShowLogBackend):
+    """
+    Collects entries in process and writes them with bulk_create once
+    max_size entries are buffered or the oldest one is max_age seconds old.
+    Pending entries are also written on process shutdown.
+
+    If dedup_window is set, views of the same object by the same user within
+    that many seconds are only logged once.
+    """
+
+    def __init__(self, max_size=100, max_age=30, dedup_window=None):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.dedup_window = dedup_window
+        self._lock = threading.Lock()
+        self._entries = []
+        self._last_seen = {}
+        self._timer = None
+        atexit.register(self.flush)
+
+    def log(self, user_id, object, action_flag):
+        now = time.time()
+        content_type_id = get_content_type_for_model(object).pk
+        if self.dedup_window and self._is_duplicate(
+                (user_id, content_type_id, force_text(object.pk), action_flag), now):
+            return
+
+        entry = self.get_log_entry(user_id, object, action_flag, content_type_id)
+        with self._lock:
+            self._entries.append(entry)
+            if len(self._entries) < self.max_size:
+                if self._timer is None:
+                    self._start_timer()
+                return
+            entries = self._take_entries()
+        self.write(entries)
+
+    def flush(self):
+        with self._lock:
+            entries = self._take_entries()
+        self.write(entries)
+
+    def write(self, entries):
+        """
+        Writes entries, logging instead of raising on failure: a write may
+        happen inside the request of any show view.
+        """
+        from django.contrib.admin.models import LogEntry
+        if not entries:
+            return
+        try:
+            # In a savepoint, not to break the transaction of the request
+            with transaction.atomic(using=router.db_for_write(LogEntry)):
+                LogEntry.objects.bulk_create(entries)
+        except DatabaseError:
+            logger.exception('Could not write %d show log entries.', len(entries))
+
+    def _is_duplicate(self, key, now):
+        with self._lock:
+            last_seen = self._last_seen.get(key)
+            if last_seen is not None and now - last_seen < self.dedup_window:
+                return True
+            if len(self._last_seen) >= self.max_size * 100:
+                self._last_seen = dict(
+                    (seen_key, seen) for seen_key, seen in self._last_seen.items()
+                    if now - seen < self.dedup_window)
+            self._last_seen[key] = now
+        return False
+
+    def _take_entries(self):
+        # Must be called holding the lock
+        entries, self._entries = self._entries, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return entries
+
+    def _start_timer(self):
+        # Must be called holding the lock
+        self._timer = threading.Timer(self.max_age, self._flush_from_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread opened its own database connection
+            connections.close_all()
+
+
+_default_backend = None
+
+
+def get_default_show_log_backend():
+    """
+    Returns the process wide backend configured by the BETTERADMIN_SHOW_LOG
+    setting, a dict with BACKEND and OPTIONS keys.
+    """
+    global _default_backend
+    if _default_backend is None:
+        config = getattr(settings, 'BETTERADMIN_SHOW_LOG', {})
+        backend_class = import_string(config.get('BACKEND', DEFAULT_SHOW_LOG_BACKEND))
+        _default_backend = backend_class(**config.get('OPTIONS', {}))
+    return _default_backend
+
+
+def reset_default_show_log_backend(**kwargs):
+    global _default_backend
+    if kwargs.get('setting', 'BETTERADMIN_SHOW_LOG') == 'BETTERADMIN_SHOW_LOG':
+        if _default_backend is not None:
+            _default_backend.flush()
+        _default_backend = None
+
+
+setting_changed.connect(reset_default_show_log_backend)
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+from django.dispatch import Signal
+
+# Sent by show views with use_show_view_timing set, timings being a list of
+# ShowViewTiming (name, duration in ms, queries)
+show_view_timed = Signal(providing_args=['model_admin', 'request', 'object_id', 'timings'])
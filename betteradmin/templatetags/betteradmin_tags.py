@@ -1,14 +1,18 @@
-from django.template import Library
+from django.template import Library, Node, TemplateSyntaxError
 
 from django.utils.text import slugify
 from django.template.loader import get_template
 from django.utils.safestring import mark_safe
-from django.db import models
 
 from django.contrib import admin
-from django.contrib.contenttypes.models import ContentType
-from django.core.urlresolvers import reverse
-from django.core.exceptions import FieldDoesNotExist
+from django.contrib.admin.utils import flatten_fieldsets
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.utils.encoding import force_text
+from django.utils.html import format_html
+
+from betteradmin.admin import (
+    SHOW_RELATED_STYLES, format_url_template, get_field_info, get_related_objects,
+    get_url_template)
 
 register = Library()
 
@@ -26,6 +30,7 @@ def readonly_field(context, field):
     if field.field['name'] in form.fields:
         base_field = form.fields[field.field['name']]
     original = context.get('original', None)
+    deferred_urls = context.get('show_deferred_urls') or {}
 
     return {
         'opts': opts,
@@ -33,58 +38,179 @@ def readonly_field(context, field):
         'original': original,
         'field': field,
         'base_field': base_field,
+        'deferred_url': deferred_urls.get(field.field['name']),
+        'adminform': context.get('adminform'),
     }
 
 
+def _get_field_info(field):
+    model_admin = field.model_admin
+    return get_field_info(model_admin.admin_site, model_admin.model, field.field['name'])
+
+
 @register.filter
 def is_db_field(field):
-    opts = field.model_admin.opts
-    return field.field['name'] in opts.get_all_field_names()
+    return _get_field_info(field) is not None
 
 
 @register.filter
 def is_email(field):
-    opts = field.model_admin.opts
-    db_field = opts.get_field(field.field['name'])
-    return isinstance(db_field, (models.EmailField,))
+    field_info = _get_field_info(field)
+    return field_info is not None and field_info.is_email
 
 
 @register.filter
 def is_url(field):
-    opts = field.model_admin.opts
-    db_field = opts.get_field(field.field['name'])
-    return isinstance(db_field, (models.URLField,))
+    field_info = _get_field_info(field)
+    return field_info is not None and field_info.is_url
 
 
 @register.filter
 def is_foreign_key(field):
-    opts = field.model_admin.opts
-    db_field = opts.get_field(field.field['name'])
-    if isinstance(db_field, (models.ForeignKey, models.OneToOneRel)):
-        admin_site = field.model_admin.admin_site
-        return admin_site.is_registered(db_field.related_model)
+    field_info = _get_field_info(field)
+    if field_info is not None and field_info.is_foreign_key:
+        return field_info.is_registered
 
     return False
 
 
+@register.inclusion_tag('betteradmin/keyset_pagination.html')
+def keyset_pagination(cl):
+    return {
+        'cl': cl,
+        'previous_url': cl.get_previous_url(),
+        'next_url': cl.get_next_url(),
+    }
+
+
 @register.filter
 def is_none(field, original):
     field_value = getattr(original, field.field['name'], None)
     return field_value is None
 
 
-@register.simple_tag
-def admin_show_url(original, field):
-    admin_site = field.model_admin.admin_site.name
-    fk_instance = getattr(original, field.field['name'])
-    if fk_instance:
-        content_type = ContentType \
-            .objects \
-            .get_for_model(fk_instance.__class__)
-        return reverse("%s:%s_%s_show" % (
-            admin_site,
-            content_type.app_label,
-            content_type.model),
-            args=(fk_instance.id,))
-
-    return ''
+def _get_related_objects(context, original, field):
+    """
+    Returns the objects related to original through the foreign keys shown
+    along with field, all loaded on the first call and kept on original.
+    """
+    name = field.field['name']
+    related_objects = getattr(original, '_betteradmin_related_objects', None)
+    if related_objects is None:
+        related_objects = original._betteradmin_related_objects = {}
+    if name not in related_objects:
+        model_admin = field.model_admin
+        adminform = context.get('adminform')
+        if adminform is not None:
+            names = flatten_fieldsets(adminform.fieldsets)
+        else:
+            names = [name]
+        field_infos = [get_field_info(model_admin.admin_site, model_admin.model, field_name)
+                       for field_name in names
+                       if not callable(field_name) and field_name not in related_objects]
+        related_objects.update(get_related_objects(
+            original, [field_info for field_info in field_infos if field_info is not None]))
+    return related_objects
+
+
+def _get_related_object(context, original, field, field_info):
+    if field_info.attname is None:
+        # Reverse one to one, nothing to read the pk from
+        try:
+            return getattr(original, field_info.name)
+        except ObjectDoesNotExist:
+            return None
+    return _get_related_objects(context, original, field).get(field_info.name)
+
+
+@register.simple_tag(takes_context=True)
+def admin_show_url(context, original, field):
+    """
+    Returns the show view url of the object related to original through
+    the foreign key field, built from its raw value when it is the pk.
+    """
+    field_info = _get_field_info(field)
+    if field_info is None or field_info.show_url_name is None:
+        return ''
+    if field_info.attname is not None and field_info.to_field is None:
+        pk = getattr(original, field_info.attname)
+    else:
+        related = _get_related_object(context, original, field, field_info)
+        pk = related.pk if related is not None else None
+    if pk is None:
+        return ''
+    url_template = get_url_template(field_info.show_url_name,
+                                    current_app=field.model_admin.admin_site.name)
+    return format_url_template(url_template, pk)
+
+
+@register.simple_tag(takes_context=True)
+def admin_show_link(context, original, field):
+    """
+    Renders a link to the show view of the object related to original
+    through the foreign key field. The related objects of all the foreign
+    keys displayed are loaded at once.
+    """
+    field_info = _get_field_info(field)
+    if field_info is None or not field_info.is_foreign_key:
+        return ''
+    related = _get_related_object(context, original, field, field_info)
+    if related is None:
+        return ''
+    if field_info.show_url_name is None:
+        return force_text(related)
+    url_template = get_url_template(field_info.show_url_name,
+                                    current_app=field.model_admin.admin_site.name)
+    return format_html('<a href="{}">{}</a>', format_url_template(url_template, related.pk),
+                       related)
+
+
+@register.simple_tag(takes_context=True)
+def show_related(context, original, name, style='related', limit=None):
+    """
+    Renders the betteradmin/fields template of style (see
+    SHOW_RELATED_STYLES) for the many-valued relation name of original,
+    with at most limit objects (show_related_limit of the model admin by
+    default) and a link loading the others:
+
+        {% show_related original "groups" "related_list_rows" %}
+    """
+    model_admin = context['adminform'].model_admin
+    if limit is None:
+        limit = model_admin.show_related_limit
+    if style not in SHOW_RELATED_STYLES:
+        raise TemplateSyntaxError("Unknown show_related style '%s'." % style)
+    related_context = model_admin.get_show_related_items(original, name, style, limit)
+    return get_template('betteradmin/fields/show_%s.html' % style).render(related_context)
+
+
+class ShowFragmentNode(Node):
+
+    def __init__(self, nodelist, name):
+        self.nodelist = nodelist
+        self.name = name
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        fragment = (context.get('show_fragments') or {}).get(name)
+        if fragment is None:
+            return self.nodelist.render(context)
+        if not fragment.is_cached:
+            fragment.save(self.nodelist.render(context))
+        return mark_safe(fragment.content)
+
+
+@register.tag
+def show_fragment(parser, token):
+    """
+    Caches the enclosed block of the show view when its model admin has
+    use_show_fragment_cache enabled:
+
+        {% show_fragment "field_sets" %} ... {% endshow_fragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise TemplateSyntaxError("'%s' takes one argument, the fragment name." % bits[0])
+    nodelist = parser.parse(('endshow_fragment',))
+    parser.delete_first_token()
+    return ShowFragmentNode(nodelist, parser.compile_filter(bits[1]))
@@ -1,3 +1,1209 @@
-from django.test import TestCase
+import base64
+import json
+import logging.handlers
+import threading
+import time
+from unittest import skipIf
 
-# Create your tests here.
+from django import forms
+from django.conf.urls import url
+from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.utils import quote
+from django.contrib.admin.models import ADDITION, LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.core.urlresolvers import ResolverMatch, reverse
+from django.template import Context, Template
+from django.template.loader import render_to_string
+from django.db import DEFAULT_DB_ALIAS, connection, connections, models
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.encoding import force_text
+
+from betteradmin.admin import (
+    SHOW, BetterAdminSite, BetterModelAdmin, ShowForm, ShowInlineModelAdmin, get_lookups_plan)
+from betteradmin.cache import show_template_cache
+from betteradmin.inlines import (
+    ShowInlineRowSet, ThreadPoolExecutor, can_load_concurrently, load_concurrently)
+from betteradmin.showlog import BufferedShowLogBackend
+from betteradmin.signals import show_view_timed
+from betteradmin.templatetags.betteradmin_tags import (
+    admin_show_link, admin_show_url, is_db_field, is_foreign_key)
+
+
+class TaggedItem(models.Model):
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey()
+
+    class Meta:
+        app_label = 'betteradmin'
+        managed = False
+
+
+class Code(models.Model):
+    code = models.CharField(max_length=50, primary_key=True)
+
+    class Meta:
+        app_label = 'betteradmin'
+        # Created by ShowUrlTemplateTests only
+        managed = False
+
+
+class MembershipInline(admin.TabularInline):
+    model = User.groups.through
+
+
+class GroupShowAdmin(BetterModelAdmin):
+    inlines = [MembershipInline]
+    show_inline_page_size = 2
+    use_show_batch = True
+    use_show_json = True
+
+
+class UserShowAdmin(BetterModelAdmin):
+    fields = ['username', 'email', 'date_joined']
+    list_display = ['username', 'email']
+    use_show_view_conditional = True
+    show_last_modified_field = 'date_joined'
+    use_keyset_pagination = True
+    list_per_page = 2
+    show_load_only_displayed = True
+    show_deferred_fields = ['email']
+    use_changelist_export = True
+    export_chunk_size = 2
+    use_show_json = True
+
+
+def user_email(obj):
+    return obj.user.email
+user_email.admin_lookups = ['user__email']
+
+
+class LogEntryShowAdmin(BetterModelAdmin):
+    list_display = ['action_time', 'content_type', user_email]
+    use_changelist_join_planning = True
+    changelist_load_only_displayed = True
+
+
+site = BetterAdminSite(name='betteradmin_urls')
+site.register(Group, GroupShowAdmin)
+site.register(User, UserShowAdmin)
+site.register(LogEntry, LogEntryShowAdmin)
+
+other_site = BetterAdminSite(name='betteradmin_other')
+other_site.register(User, UserShowAdmin)
+other_site.register(Code, BetterModelAdmin)
+
+urlpatterns = [
+    url(r'^other/', other_site.urls),
+    # Last, the default instance of the admin namespace
+    url(r'^admin/', site.urls),
+]
+
+
+class ShowInlineInstancesTests(TestCase):
+
+    def setUp(self):
+        self.site = BetterAdminSite(name='betteradmin_tests')
+        self.site.register(Group, GroupShowAdmin)
+        self.model_admin = self.site._registry[Group]
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.group = Group.objects.create(name='staff')
+
+    def get_request(self, url_name):
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        request.resolver_match = ResolverMatch(lambda request: None, (), {}, url_name=url_name)
+        return request
+
+    def test_show_inline_classes_are_reused(self):
+        inline_classes = set()
+        for _ in range(3):
+            request = self.get_request('auth_group_show')
+            inlines = self.model_admin.get_inline_instances(request, self.group)
+            self.assertEqual(len(inlines), 1)
+            inline_classes.add(type(inlines[0]))
+
+        self.assertEqual(len(inline_classes), 1)
+        inline_class = inline_classes.pop()
+        self.assertTrue(issubclass(inline_class, ShowInlineModelAdmin))
+        self.assertTrue(issubclass(inline_class, MembershipInline))
+
+    def test_show_inline_classes_are_per_admin(self):
+        other_site = BetterAdminSite(name='betteradmin_other')
+        other_site.register(Group, GroupShowAdmin)
+        other_admin = other_site._registry[Group]
+        self.assertIsNot(self.model_admin.get_show_inline_class(MembershipInline),
+                         other_admin.get_show_inline_class(MembershipInline))
+
+    def test_change_view_uses_original_inline_classes(self):
+        request = self.get_request('auth_group_change')
+        inlines = self.model_admin.get_inline_instances(request, self.group)
+        self.assertEqual([type(inline) for inline in inlines], [MembershipInline])
+
+
+class UserShowForm(forms.ModelForm):
+
+    class Meta:
+        model = User
+        fields = ['last_name', 'username', 'first_name', 'email']
+        labels = {'username': 'Login'}
+        help_texts = {'last_name': 'Family name'}
+
+
+class UserFormShowAdmin(BetterModelAdmin):
+    form = UserShowForm
+    readonly_fields = ['date_joined']
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowFormTests(TestCase):
+
+    def setUp(self):
+        self.site = BetterAdminSite(name='betteradmin_tests')
+        self.site.register(User, UserFormShowAdmin)
+        self.model_admin = self.site._registry[User]
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.superuser.last_name = 'Smith'
+        self.superuser.save()
+
+    def get_request(self):
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        request.resolver_match = ResolverMatch(lambda request: None, (), {}, url_name='auth_user_show')
+        return request
+
+    def assertSameFieldsAsForm(self):
+        request = self.get_request()
+        self.assertEqual(self.model_admin.get_show_fields(request),
+                         admin.ModelAdmin.get_fields(self.model_admin, request))
+
+    def test_fields_follow_meta_fields(self):
+        self.assertEqual(self.model_admin.get_show_fields(self.get_request()),
+                         ['last_name', 'username', 'first_name', 'email', 'date_joined'])
+        self.assertSameFieldsAsForm()
+
+    def test_exclude(self):
+        self.model_admin.form = forms.ModelForm
+        self.model_admin.exclude = ['password', 'user_permissions']
+        self.assertSameFieldsAsForm()
+        self.assertNotIn('password', self.model_admin.get_show_fields(self.get_request()))
+
+        class ExcludeForm(forms.ModelForm):
+            class Meta:
+                model = User
+                exclude = ['password', 'groups']
+        self.model_admin.form = ExcludeForm
+        self.model_admin.exclude = None
+        self.assertSameFieldsAsForm()
+        self.assertNotIn('groups', self.model_admin.get_show_fields(self.get_request()))
+
+    def test_show_view_renders_without_form(self):
+        def get_form(*args, **kwargs):
+            raise AssertionError('No form must be built on show view')
+        self.model_admin.get_form = get_form
+        response = self.model_admin.show_view(self.get_request(), str(self.superuser.pk))
+        response.render()
+        self.assertContains(response, '<label>Login:</label>', html=True)
+        self.assertContains(response, 'Family name')
+        self.assertContains(response, 'Smith')
+        self.assertContains(response, 'admin@example.com')
+        self.assertContains(response, 'Date joined')
+
+
+class GroupAllMembersAdmin(GroupShowAdmin):
+    show_inline_page_size = None
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowQueryCountTests(TestCase):
+
+    def setUp(self):
+        self.site = BetterAdminSite(name='betteradmin_tests')
+        self.site.register(LogEntry, BetterModelAdmin, fields=['user', 'content_type', 'object_repr'])
+        self.site.register(User, BetterModelAdmin, fields=['username', 'groups'])
+        self.site.register(Group, GroupAllMembersAdmin)
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.group = Group.objects.create(name='staff')
+
+    def render_show_view(self, model, obj):
+        opts = model._meta
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        request.resolver_match = ResolverMatch(
+            lambda request: None, (), {}, url_name='%s_%s_show' % (opts.app_label, opts.model_name))
+        response = self.site._registry[model].show_view(request, str(obj.pk))
+        return response.render()
+
+    def test_foreign_keys(self):
+        entry = LogEntry.objects.create(
+            user=self.superuser, content_type=ContentType.objects.get_for_model(Group),
+            object_id=str(self.group.pk), object_repr='staff', action_flag=ADDITION)
+        # The entry with its user and content type joined
+        with self.assertNumQueries(1):
+            response = self.render_show_view(LogEntry, entry)
+        self.assertContains(response, 'admin')
+
+    def test_many_to_many(self):
+        for i in range(3):
+            self.superuser.groups.add(Group.objects.create(name='group%d' % i))
+        # The user, then its groups
+        with self.assertNumQueries(2):
+            response = self.render_show_view(User, self.superuser)
+        self.assertContains(response, 'group2')
+
+    def test_inline_rows_foreign_key(self):
+        for i in range(3):
+            User.objects.create_user('user%d' % i).groups.add(self.group)
+        # The group, its permissions, then the membership rows with their
+        # user joined
+        with self.assertNumQueries(3):
+            response = self.render_show_view(Group, self.group)
+        self.assertContains(response, 'user2')
+
+
+class FieldIndexTests(TestCase):
+
+    def setUp(self):
+        self.site = BetterAdminSite(name='betteradmin_tests')
+        self.site.register(ContentType, BetterModelAdmin)
+        self.site.register(TaggedItem, BetterModelAdmin)
+        self.model_admin = self.site._registry[TaggedItem]
+
+    def get_field(self, name):
+        item = TaggedItem(content_type=ContentType.objects.get_for_model(Group), object_id=1)
+        return helpers.AdminReadonlyField(ShowForm(item), name, is_first=True,
+                                          model_admin=self.model_admin)
+
+    def test_generic_foreign_key(self):
+        index = self.site.get_field_index(TaggedItem)
+        self.assertIsNone(index['content_object'].kind)
+        self.assertEqual(index['content_type'].kind, 'ForeignKey')
+
+    def test_filters(self):
+        self.assertTrue(is_db_field(self.get_field('content_object')))
+        self.assertFalse(is_foreign_key(self.get_field('content_object')))
+        self.assertTrue(is_foreign_key(self.get_field('content_type')))
+
+
+class GroupFragmentAdmin(GroupShowAdmin):
+    use_show_fragment_cache = True
+
+
+class LogEntryInline(admin.TabularInline):
+    model = LogEntry
+
+
+class UserFragmentAdmin(BetterModelAdmin):
+    fields = ['username']
+    inlines = [LogEntryInline]
+    use_show_fragment_cache = True
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowFragmentCacheTests(TestCase):
+
+    def setUp(self):
+        # No URLconf is built for this site, invalidation must not need it
+        self.site = BetterAdminSite(name='betteradmin_fragments')
+        self.site.register(Group, GroupFragmentAdmin)
+        self.site.register(User, UserFragmentAdmin)
+        self.model_admin = self.site._registry[Group]
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.group = Group.objects.create(name='staff')
+        self.group.user_set.add(self.superuser)
+
+    def get_request(self, user=None):
+        request = RequestFactory().get('/')
+        request.user = user or self.superuser
+        request.resolver_match = ResolverMatch(lambda request: None, (), {}, url_name='auth_group_show')
+        return request
+
+    def get_fragments(self):
+        response = self.model_admin.show_view(self.get_request(), str(self.group.pk))
+        # Fragments missing from the cache are stored while rendering
+        cached = dict((name, fragment.is_cached)
+                      for name, fragment in response.context_data['show_fragments'].items())
+        response.render()
+        return cached
+
+    def test_cache_hit(self):
+        self.assertEqual(self.get_fragments(), {'field_sets': False, 'inline_field_sets': False})
+        self.assertEqual(self.get_fragments(), {'field_sets': True, 'inline_field_sets': True})
+
+    def test_invalidated_on_save(self):
+        self.get_fragments()
+        self.group.save()
+        self.assertEqual(self.get_fragments(), {'field_sets': False, 'inline_field_sets': False})
+
+    def test_invalidated_on_inline_save(self):
+        model_admin = self.site._registry[User]
+
+        def get_inline_fragment():
+            request = self.get_request()
+            request.resolver_match.url_name = 'auth_user_show'
+            response = model_admin.show_view(request, str(self.superuser.pk))
+            cached = response.context_data['show_fragments']['inline_field_sets'].is_cached
+            response.render()
+            return cached
+
+        get_inline_fragment()
+        self.assertTrue(get_inline_fragment())
+        LogEntry.objects.create(
+            user=self.superuser, content_type=ContentType.objects.get_for_model(Group),
+            object_id=str(self.group.pk), object_repr='staff', action_flag=ADDITION)
+        self.assertFalse(get_inline_fragment())
+
+    def test_invalidated_on_m2m_changed(self):
+        self.get_fragments()
+        self.group.permissions.add(Permission.objects.get(codename='change_group'))
+        self.assertEqual(self.get_fragments(), {'field_sets': False, 'inline_field_sets': False})
+
+    def test_key_changes_with_permissions(self):
+        viewer = User.objects.create_user('viewer', is_staff=True)
+        viewer.user_permissions.add(Permission.objects.get(codename='change_group'))
+        fieldsets = self.model_admin.get_fieldsets(self.get_request(), self.group)
+        keys = [self.model_admin.get_show_fragment_key(
+            self.get_request(user), self.group, 'field_sets', fieldsets)
+            for user in (self.superuser, User.objects.get(pk=viewer.pk))]
+        self.assertNotEqual(keys[0], keys[1])
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowViewConditionalTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.superuser)
+        self.url = reverse('admin:auth_user_show', args=(self.superuser.pk,))
+
+    def test_validators_are_sent(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_permission_changes_invalidate_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.superuser.is_superuser = False
+        self.superuser.save()
+        self.superuser.user_permissions.add(*Permission.objects.filter(codename='change_user'))
+        self.client.force_login(User.objects.get(pk=self.superuser.pk))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowDeferredFieldsTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.superuser)
+
+    def test_only_displayed_fields_are_loaded(self):
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        obj = site._registry[User].get_show_object(request, str(self.superuser.pk))
+        deferred = obj.get_deferred_fields()
+        self.assertIn('password', deferred)
+        self.assertIn('email', deferred)
+        self.assertNotIn('username', deferred)
+
+    def test_deferred_field_is_loaded_on_demand(self):
+        field_url = reverse('admin:auth_user_show_field', args=(self.superuser.pk, 'email'))
+        response = self.client.get(reverse('admin:auth_user_show', args=(self.superuser.pk,)))
+        self.assertContains(response, field_url)
+        self.assertNotContains(response, 'admin@example.com')
+        self.assertContains(self.client.get(field_url), 'admin@example.com')
+
+    def test_only_deferred_fields_can_be_loaded(self):
+        field_url = reverse('admin:auth_user_show_field', args=(self.superuser.pk, 'password'))
+        self.assertEqual(self.client.get(field_url).status_code, 404)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowViewTimingTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.group = Group.objects.create(name='staff')
+        self.superuser.groups.add(self.group)
+        self.client.force_login(self.superuser)
+        self.model_admin = site._registry[Group]
+        self.model_admin.use_show_view_timing = True
+        self.addCleanup(delattr, self.model_admin, 'use_show_view_timing')
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('admin:auth_group_show', args=(self.group.pk,)))
+        self.assertIn('fetch;dur=', response['Server-Timing'])
+        self.assertIn('render;dur=', response['Server-Timing'])
+
+    def test_timings_are_sent(self):
+        received = []
+
+        def receiver(sender, timings, **kwargs):
+            received.append(dict((timing.name, timing) for timing in timings))
+
+        show_view_timed.connect(receiver)
+        self.addCleanup(show_view_timed.disconnect, receiver)
+        self.client.get(reverse('admin:auth_group_show', args=(self.group.pk,)))
+        self.assertEqual(len(received), 1)
+        # The group and its prefetched permissions
+        self.assertEqual(received[0]['fetch'].queries, 2)
+        self.assertGreater(received[0]['inlines'].queries, 0)
+
+    def test_disabled_by_default(self):
+        del self.model_admin.use_show_view_timing
+        self.addCleanup(setattr, self.model_admin, 'use_show_view_timing', True)
+        response = self.client.get(reverse('admin:auth_group_show', args=(self.group.pk,)))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+
+class BufferedShowLogBackendTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('viewer')
+        self.groups = [Group.objects.create(name='group %d' % i) for i in range(3)]
+
+    def test_flush_by_size(self):
+        backend = BufferedShowLogBackend(max_size=3, max_age=60)
+        backend.log(self.user.pk, self.groups[0], SHOW)
+        backend.log(self.user.pk, self.groups[1], SHOW)
+        self.assertEqual(LogEntry.objects.count(), 0)
+        with CaptureQueriesContext(connection) as queries:
+            backend.log(self.user.pk, self.groups[2], SHOW)
+        self.assertEqual([query['sql'].split()[0] for query in queries
+                          if 'SAVEPOINT' not in query['sql']], ['INSERT'])
+        self.assertEqual(LogEntry.objects.filter(action_flag=SHOW).count(), 3)
+
+    def test_write_error_is_logged(self):
+        handler = logging.handlers.BufferingHandler(10)
+        logger = logging.getLogger('betteradmin')
+        logger.addHandler(handler)
+        backend = BufferedShowLogBackend(max_size=1, max_age=60)
+        try:
+            # No user, violating the NOT NULL constraint of LogEntry.user
+            backend.log(None, self.groups[0], SHOW)
+        finally:
+            logger.removeHandler(handler)
+        self.assertEqual(len(handler.buffer), 1)
+        self.assertEqual(LogEntry.objects.count(), 0)
+
+    def test_content_type_passed_to_entry(self):
+        content_type_ids = []
+
+        class Backend(BufferedShowLogBackend):
+            def get_log_entry(self, user_id, object, action_flag, content_type_id=None):
+                content_type_ids.append(content_type_id)
+                return super(Backend, self).get_log_entry(
+                    user_id, object, action_flag, content_type_id)
+
+        backend = Backend(max_size=10, max_age=60)
+        backend.log(self.user.pk, self.groups[0], SHOW)
+        backend.flush()
+        self.assertEqual(content_type_ids, [ContentType.objects.get_for_model(Group).pk])
+        self.assertEqual(LogEntry.objects.get().content_type_id, content_type_ids[0])
+
+    def test_create_log_entry_is_called(self):
+        calls = []
+
+        class LoggingGroupAdmin(BetterModelAdmin):
+            use_show_view_log = True
+
+            def _create_log_entry(self, request, object, action_flag):
+                calls.append((object, action_flag))
+
+        request = RequestFactory().get('/')
+        request.user = self.user
+        LoggingGroupAdmin(Group, site).log_show(request, self.groups[0])
+        self.assertEqual(calls, [(self.groups[0], SHOW)])
+
+    def test_flush(self):
+        backend = BufferedShowLogBackend(max_size=10, max_age=60)
+        backend.log(self.user.pk, self.groups[0], SHOW)
+        backend.flush()
+        self.assertEqual(LogEntry.objects.count(), 1)
+        backend.flush()
+        self.assertEqual(LogEntry.objects.count(), 1)
+
+    def test_dedup_window(self):
+        backend = BufferedShowLogBackend(max_size=10, max_age=60, dedup_window=60)
+        for _ in range(3):
+            backend.log(self.user.pk, self.groups[0], SHOW)
+        backend.log(self.user.pk, self.groups[1], SHOW)
+        backend.flush()
+        self.assertEqual(LogEntry.objects.count(), 2)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ForeignKeyShowLinkTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('admin')
+        entry = LogEntry.objects.create(
+            user=self.user, content_type=ContentType.objects.get_for_model(User),
+            object_id=str(self.user.pk), object_repr='admin', action_flag=ADDITION)
+        self.entry = LogEntry.objects.get(pk=entry.pk)
+
+    def get_field(self, name):
+        return helpers.AdminReadonlyField(ShowForm(self.entry), name, is_first=True,
+                                          model_admin=site._registry[LogEntry])
+
+    def test_url_from_raw_value(self):
+        with self.assertNumQueries(0):
+            url = admin_show_url(Context(), self.entry, self.get_field('user'))
+        self.assertEqual(url, reverse('admin:auth_user_show', args=(self.user.pk,)))
+
+    def test_not_registered(self):
+        self.assertEqual(admin_show_url(Context(), self.entry, self.get_field('content_type')), '')
+
+    def test_links_are_loaded_at_once(self):
+        fieldsets = [(None, {'fields': ['user', 'content_type']})]
+        adminform = helpers.AdminForm(ShowForm(self.entry), fieldsets, {})
+        context = Context({'adminform': adminform})
+        with self.assertNumQueries(2):
+            link = admin_show_link(context, self.entry, self.get_field('user'))
+        with self.assertNumQueries(0):
+            text = admin_show_link(context, self.entry, self.get_field('content_type'))
+        url = reverse('admin:auth_user_show', args=(self.user.pk,))
+        self.assertEqual(link, '<a href="%s">admin</a>' % url)
+        self.assertEqual(text, 'user')
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowRelatedTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.group = Group.objects.create(name='staff')
+        self.group.permissions.add(*Permission.objects.order_by('pk')[:3])
+        self.superuser.groups.add(self.group)
+        self.client.force_login(self.superuser)
+        self.model_admin = site._registry[Group]
+
+    def test_items_are_capped(self):
+        context = self.model_admin.get_show_related_items(self.group, 'permissions', limit=2)
+        self.assertEqual(len(context['items']), 2)
+        self.assertEqual(context['total_count'], 3)
+        self.assertIsNone(context['items'][0].show_url)
+        self.assertTrue(context['show_all_url'].endswith(
+            '/show/related/permissions/?style=related'))
+
+    def test_no_count_below_limit(self):
+        with self.assertNumQueries(1):
+            context = self.model_admin.get_show_related_items(self.group, 'permissions', limit=3)
+        self.assertEqual(context['total_count'], 3)
+        self.assertIsNone(context['show_all_url'])
+
+    def test_show_related_fields_are_not_prefetched(self):
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        # permissions is in the fieldsets of GroupShowAdmin
+        self.assertIn('permissions', self.model_admin.get_show_related_lookups(request)[1])
+        self.model_admin.show_related_fields = ['permissions']
+        self.addCleanup(delattr, self.model_admin, 'show_related_fields')
+        self.assertEqual(self.model_admin.get_show_related_lookups(request), ([], []))
+
+        group = self.model_admin.get_show_object(request, self.group.pk)
+        with CaptureQueriesContext(connection) as queries:
+            context = self.model_admin.get_show_related_items(group, 'permissions', limit=1)
+        self.assertEqual(len(context['items']), 1)
+        self.assertEqual(context['total_count'], 3)
+        # limit + 1 rows, then the count
+        self.assertEqual(len(queries), 2)
+        self.assertIn('LIMIT 2', queries[0]['sql'])
+
+    def test_item_show_urls(self):
+        context = self.model_admin.get_show_related_items(self.group, 'user', limit=2)
+        self.assertEqual(context['items'][0].show_url,
+                         reverse('admin:auth_user_show', args=(self.superuser.pk,)))
+
+    def test_tag(self):
+        adminform = helpers.AdminForm(ShowForm(self.group), [], {}, model_admin=self.model_admin)
+        template = Template('{% load betteradmin_tags %}'
+                            '{% show_related original "permissions" "related_list_rows" limit=1 %}')
+        content = template.render(Context({'adminform': adminform, 'original': self.group}))
+        self.assertEqual(content.count('<li>'), 1)
+        self.assertIn('Show all (3)', content)
+
+    def test_show_all(self):
+        url = reverse('admin:auth_group_show_related', args=(self.group.pk, 'permissions'))
+        response = self.client.get(url, {'style': 'related_nolink'})
+        self.assertEqual(len(response.context['items']), 3)
+        self.assertIsNone(response.context['show_all_url'])
+
+    def test_show_all_only_shown_relations(self):
+        url = reverse('admin:auth_group_show_related', args=(self.group.pk, 'user'))
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ChangeListExportTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        for i in range(3):
+            User.objects.create_user('user%d' % i, 'user%d@example.com' % i)
+        self.client.force_login(self.superuser)
+
+    def get_content(self, export_format, query_string=''):
+        url = reverse('admin:auth_user_export', args=(export_format,)) + query_string
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv(self):
+        lines = self.get_content('csv').splitlines()
+        self.assertEqual(lines[0], 'Username,Email address,show_url')
+        self.assertEqual(len(lines), 5)
+        self.assertIn('admin,admin@example.com,http://testserver%s' % reverse(
+            'admin:auth_user_show', args=(self.superuser.pk,)), lines)
+
+    def test_jsonl_follows_changelist_ordering(self):
+        # Descending email, the changelist column 0 being the action checkbox
+        rows = [json.loads(line) for line in self.get_content('jsonl', '?o=-2').splitlines()]
+        self.assertEqual([row['username'] for row in rows], ['user2', 'user1', 'user0', 'admin'])
+        self.assertEqual(set(rows[0]), set(['username', 'email', 'show_url']))
+
+    def test_permission_denied(self):
+        self.client.force_login(User.objects.create_user('viewer', password='password', is_staff=True))
+        url = reverse('admin:auth_user_export', args=('csv',))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowBatchTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.groups = [Group.objects.create(name='group%d' % i) for i in range(4)]
+        for i, group in enumerate(self.groups):
+            for j in range(i + 1):
+                User.objects.create_user('user%d-%d' % (i, j)).groups.add(group)
+        self.client.force_login(self.superuser)
+        self.url = reverse('admin:auth_group_show_batch')
+
+    def get_batch(self, groups):
+        return self.client.get(self.url, {'ids': ','.join(str(group.pk) for group in groups)})
+
+    def test_action_redirects_to_batch(self):
+        response = self.client.post(reverse('admin:auth_group_changelist'), {
+            'action': 'show_selected',
+            '_selected_action': [self.groups[0].pk, self.groups[2].pk],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(self.url, response['Location'])
+
+    def test_action_limited_to_show_batch_max(self):
+        model_admin = site._registry[Group]
+        model_admin.show_batch_max = 2
+        self.addCleanup(delattr, model_admin, 'show_batch_max')
+        response = self.client.post(reverse('admin:auth_group_changelist'), {
+            'action': 'show_selected',
+            '_selected_action': [group.pk for group in self.groups],
+        }, follow=True)
+        self.assertEqual(len(response.context['show_objects']), 2)
+        self.assertEqual([force_text(message) for message in response.context['messages']],
+                         ['Only the first 2 selected groups are shown.'])
+
+    def test_objects_and_inline_rows(self):
+        response = self.get_batch([self.groups[2], self.groups[0]])
+        show_objects = response.context['show_objects']
+        self.assertEqual([show_object['original'] for show_object in show_objects],
+                         [self.groups[2], self.groups[0]])
+        rowsets = [show_object['inline_admin_formsets'][0] for show_object in show_objects]
+        # Cut to the show_inline_page_size of GroupShowAdmin
+        self.assertEqual([len(list(rowset)) for rowset in rowsets], [2, 1])
+        self.assertEqual([rowset.show_total_count for rowset in rowsets], [3, 1])
+        self.assertEqual(rowsets[0].show_more_url, '%s?offset=2' % reverse(
+            'admin:auth_group_show_inline', args=(self.groups[2].pk, 0)))
+        self.assertIsNone(rowsets[1].show_more_url)
+
+    def test_query_count_does_not_depend_on_objects(self):
+        # Session, user, groups, permissions, membership counts, memberships
+        # with their users
+        with self.assertNumQueries(6):
+            self.get_batch(self.groups[:1])
+        with self.assertNumQueries(6):
+            self.get_batch(self.groups[:2])
+        # Plus the first page of each of the two groups with more memberships
+        with self.assertNumQueries(8):
+            self.get_batch(self.groups)
+
+    def test_objects_are_logged(self):
+        model_admin = site._registry[Group]
+        model_admin.use_show_view_log = True
+        self.addCleanup(delattr, model_admin, 'use_show_view_log')
+        self.get_batch(self.groups[:2])
+        self.assertEqual(sorted(LogEntry.objects.filter(action_flag=SHOW).values_list(
+            'object_id', flat=True)), sorted(str(group.pk) for group in self.groups[:2]))
+
+    def test_permission_denied(self):
+        self.client.force_login(User.objects.create_user('viewer', password='password', is_staff=True))
+        self.assertEqual(self.get_batch(self.groups).status_code, 403)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowTemplateCacheTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.superuser)
+        self.url = reverse('admin:auth_group_show', args=(Group.objects.create(name='staff').pk,))
+        show_template_cache.clear()
+
+    def test_template_is_resolved_once(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, 'betteradmin/show_object.html')
+        self.assertEqual(show_template_cache.info(), (1, 1, 1))
+
+    def test_cleared_on_settings_change(self):
+        self.client.get(self.url)
+        with self.settings(DEBUG=True):
+            self.assertEqual(show_template_cache.info().size, 0)
+
+
+class PermissionCacheTests(TestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.model_admin = site._registry[Group]
+
+    def test_checks_are_memoized_per_request(self):
+        self.assertTrue(self.model_admin.has_show_permission(self.request))
+        self.request.user.is_superuser = False
+        self.assertTrue(self.model_admin.has_show_permission(self.request))
+        self.assertFalse(self.model_admin.has_delete_permission(self.request))
+
+    def test_keyed_by_object(self):
+        group = Group.objects.create(name='staff')
+        self.assertTrue(self.model_admin.has_change_permission(self.request))
+        self.request.user.is_superuser = False
+        self.assertFalse(self.model_admin.has_change_permission(self.request, group))
+
+    def test_keyed_by_model(self):
+        other_site = BetterAdminSite(name='betteradmin_permissions')
+        other_site.register([Group, User])
+        user = User.objects.create_user('editor', is_staff=True)
+        user.user_permissions.add(Permission.objects.get(codename='change_group'))
+        self.request.user = User.objects.get(pk=user.pk)
+        group = Group.objects.create(pk=user.pk, name='staff')
+        self.assertTrue(other_site._registry[Group].has_change_permission(self.request))
+        self.assertFalse(other_site._registry[User].has_change_permission(self.request))
+        self.assertTrue(other_site._registry[Group].has_change_permission(self.request, group))
+        self.assertFalse(other_site._registry[User].has_change_permission(self.request, user))
+
+    def test_disabled(self):
+        self.model_admin.use_permission_cache = False
+        self.addCleanup(delattr, self.model_admin, 'use_permission_cache')
+        self.assertTrue(self.model_admin.has_show_permission(self.request))
+        self.request.user.is_superuser = False
+        self.assertFalse(self.model_admin.has_show_permission(self.request))
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        for i in range(4):
+            User.objects.create_user('user%d' % i, 'user%d@example.com' % (i % 2))
+        self.client.force_login(self.superuser)
+        self.url = reverse('admin:auth_user_changelist')
+
+    def get_pages(self, query_string):
+        pages = []
+        url = self.url + query_string
+        while url:
+            cl = self.client.get(url).context['cl']
+            self.assertTrue(cl.is_keyset_paginated)
+            pages.append([user.username for user in cl.result_list])
+            url = cl.get_next_url() and self.url + cl.get_next_url()
+        return pages
+
+    def test_pages(self):
+        pages = self.get_pages('')
+        self.assertEqual(pages, [['user3', 'user2'], ['user1', 'user0'], ['admin']])
+
+    def test_ordering_with_tiebreaker(self):
+        # Ordered by email, then by the pk tiebreaker
+        pages = self.get_pages('?o=-2')
+        usernames = [username for page in pages for username in page]
+        self.assertEqual(len(usernames), 5)
+        self.assertEqual(usernames[:2], ['user3', 'user1'])
+
+    def test_previous_page(self):
+        cl = self.client.get(self.url).context['cl']
+        cl = self.client.get(self.url + cl.get_next_url()).context['cl']
+        cl = self.client.get(self.url + cl.get_previous_url()).context['cl']
+        self.assertEqual([user.username for user in cl.result_list], ['user3', 'user2'])
+        self.assertIsNone(cl.get_previous_url())
+
+    def test_template(self):
+        self.assertTemplateUsed(self.client.get(self.url), 'betteradmin/change_list.html')
+        # Neither keyset pagination nor export on the groups
+        response = self.client.get(reverse('admin:auth_group_changelist'))
+        self.assertTemplateUsed(response, 'admin/change_list.html')
+        self.assertTemplateNotUsed(response, 'betteradmin/change_list.html')
+
+    def test_no_selection_across_pages_without_exact_count(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.context['actions_selection_counter'])
+        self.assertNotIn(b'Select all', response.content)
+
+        model_admin = site._registry[User]
+        model_admin.keyset_pagination_count = 'exact'
+        self.addCleanup(delattr, model_admin, 'keyset_pagination_count')
+        response = self.client.get(self.url)
+        self.assertTrue(response.context['actions_selection_counter'])
+        self.assertIn(b'Select all 5', response.content)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url + '?cursor=invalid')
+        self.assertEqual(response.status_code, 302)
+        for data in ({'f': 1, 'v': 1}, {'f': 1, 'v': [None]}, {'f': True, 'v': [None]}):
+            cursor = base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii')
+            response = self.client.get(self.url, {'cursor': cursor})
+            self.assertEqual(response.status_code, 302)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowUrlTemplateTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            editor.create_model(Code)
+        super(ShowUrlTemplateTests, cls).setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(ShowUrlTemplateTests, cls).tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(Code)
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.superuser)
+
+    def get_result_urls(self, url_name, current_app):
+        cl = self.client.get(reverse(url_name, current_app=current_app)).context['cl']
+        return dict((result.pk, cl.url_for_result(result)) for result in cl.result_list)
+
+    def test_integer_pk(self):
+        for current_app in (site.name, other_site.name):
+            urls = self.get_result_urls('admin:auth_user_changelist', current_app)
+            self.assertEqual(urls[self.superuser.pk], reverse(
+                'admin:auth_user_show', args=(self.superuser.pk,), current_app=current_app))
+        self.assertTrue(urls[self.superuser.pk].startswith('/other/'))
+
+    def test_quoted_pk(self):
+        codes = [u'a/b', u'a_b', u'\xf1and\xfa/\xfc_1', u'x:y?z=1 %']
+        for code in codes:
+            Code.objects.create(code=code)
+        urls = self.get_result_urls('admin:betteradmin_code_changelist', other_site.name)
+        for code in codes:
+            url = reverse('admin:betteradmin_code_show', args=(quote(code),),
+                          current_app=other_site.name)
+            self.assertEqual(urls[code], url)
+            self.assertEqual(self.client.get(url).context['original'].pk, code)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowInlinePaginationTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.group = Group.objects.create(name='staff')
+        for i in range(3):
+            User.objects.create_user('user%d' % i).groups.add(self.group)
+        self.client.force_login(self.superuser)
+
+    def test_first_page(self):
+        response = self.client.get(reverse('admin:auth_group_show', args=(self.group.pk,)))
+        inline_admin_formset = response.context['inline_admin_formsets'][0]
+        self.assertEqual(len(list(inline_admin_formset)), 2)
+        self.assertEqual(inline_admin_formset.show_total_count, 3)
+        self.assertTrue(inline_admin_formset.show_more_url.endswith('?offset=2'))
+
+    def test_next_page(self):
+        url = reverse('admin:auth_group_show_inline', args=(self.group.pk, 0))
+        response = self.client.get(url, {'offset': 2})
+        inline_admin_formset = response.context['inline_admin_formset']
+        self.assertEqual(len(list(inline_admin_formset)), 1)
+        self.assertIsNone(inline_admin_formset.show_more_url)
+        # Only the rows, appended to the inline group of the show view
+        self.assertTemplateUsed(response, 'betteradmin/edit_inline/show_tabular_rows.html')
+        self.assertTemplateNotUsed(response, 'betteradmin/edit_inline/show_tabular.html')
+        self.assertNotContains(response, 'inline-group')
+        self.assertNotContains(response, '<h2>')
+        self.assertContains(response, '<tbody class="show-inline-rows">')
+        self.assertContains(response, '<tr class="form-row', count=1)
+
+    def test_stacked_rows_numbered_from_offset(self):
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        model_admin = site._registry[Group]
+        inline_class = type(str('MembershipStackedInline'), (admin.StackedInline,), {
+            'model': User.groups.through, 'show_original': False, 'fields': ['id']})
+        inline = model_admin.get_show_inline_class(inline_class)(Group, site)
+        rowset = model_admin.get_show_inline_rowset(request, inline, self.group, offset=2)
+        content = render_to_string('betteradmin/show_inline_page.html',
+                                   {'inline_admin_formset': rowset})
+        self.assertIn('<div class="show-inline-rows">', content)
+        self.assertEqual(content.count('class="inline-related'), 1)
+        self.assertIn('<span class="inline_label">#3</span>', content)
+
+    def test_show_template(self):
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        model_admin = site._registry[Group]
+        inline_class = type(str('MembershipStackedInline'), (admin.StackedInline,), {
+            'model': User.groups.through, 'template': 'admin/edit_inline/tabular.html'})
+        inline = model_admin.get_show_inline_class(inline_class)(Group, site)
+        rowset = ShowInlineRowSet(inline, list(inline.get_fieldsets(request)), [])
+        self.assertEqual(rowset.template, 'betteradmin/edit_inline/show_stacked.html')
+        inline.show_template = 'custom_show_stacked.html'
+        self.assertEqual(rowset.template, 'custom_show_stacked.html')
+
+    def test_rows_render_without_formset(self):
+        response = self.client.get(reverse('admin:auth_group_show', args=(self.group.pk,)))
+        inline_admin_formset = response.context['inline_admin_formsets'][0]
+        self.assertEqual([column.name for column in inline_admin_formset.columns], ['user'])
+        self.assertNotIn('formset', vars(inline_admin_formset))
+        self.assertContains(response, '<td class="field-user"><p>user0</p></td>', html=True)
+
+    def test_rows_from_values(self):
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        model_admin = site._registry[Group]
+        inline = model_admin.get_show_inline_class(MembershipInline)(Group, site)
+        inline.show_original = False
+        inline.fields = ['id']
+        rowset = model_admin.get_show_inline_rowset(request, inline, self.group)
+        rows = list(rowset)
+        self.assertIsNone(rows[0].original)
+        self.assertEqual(rows[0].cells[0].contents, str(rows[0].pk))
+
+    def test_permission_denied(self):
+        self.client.force_login(User.objects.create_user('viewer', password='password', is_staff=True))
+        url = reverse('admin:auth_group_show_inline', args=(self.group.pk, 0))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ConcurrentInlinesTests(TestCase):
+
+    def test_sequential_inside_transaction(self):
+        self.assertFalse(can_load_concurrently('default'))
+
+    def test_fallback_renders_same_rows(self):
+        superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        group = Group.objects.create(name='staff')
+        superuser.groups.add(group)
+        self.client.force_login(superuser)
+        model_admin = site._registry[Group]
+        model_admin.use_concurrent_inlines = True
+        try:
+            response = self.client.get(reverse('admin:auth_group_show', args=(group.pk,)))
+        finally:
+            model_admin.use_concurrent_inlines = False
+        rows = list(response.context['inline_admin_formsets'][0])
+        self.assertEqual([row.pk for row in rows], [superuser.groups.through.objects.get().pk])
+
+    @skipIf(ThreadPoolExecutor is None, 'concurrent.futures is not available')
+    def test_results_in_order_with_fallback(self):
+        main_thread = threading.current_thread()
+
+        def fail_in_worker():
+            if threading.current_thread() is not main_thread:
+                raise RuntimeError
+            return 'main'
+
+        handler = logging.handlers.BufferingHandler(10)
+        logger = logging.getLogger('betteradmin')
+        logger.addHandler(handler)
+        try:
+            results = load_concurrently([lambda: 1, fail_in_worker, lambda: 3], workers=2)
+        finally:
+            logger.removeHandler(handler)
+        self.assertEqual(results, [1, 'main', 3])
+        self.assertEqual([record.levelno for record in handler.buffer], [logging.ERROR])
+
+    @skipIf(ThreadPoolExecutor is None, 'concurrent.futures is not available')
+    def test_timeout_of_running_function(self):
+        main_thread = threading.current_thread()
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow():
+            if threading.current_thread() is not main_thread:
+                release.wait(5)
+                return 'worker'
+            return 'main'
+
+        handler = logging.handlers.BufferingHandler(10)
+        logger = logging.getLogger('betteradmin')
+        logger.addHandler(handler)
+        started = time.time()
+        try:
+            results = load_concurrently([slow, lambda: 2], workers=4, timeout=0.05)
+        finally:
+            logger.removeHandler(handler)
+        # The worker still running is not waited for
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual(results, ['main', 2])
+        self.assertEqual([record.levelno for record in handler.buffer], [logging.WARNING])
+
+
+class ConcurrentInlinesDatabaseTests(SimpleTestCase):
+
+    def test_sequential_with_in_memory_database(self):
+        self.assertFalse(connections[DEFAULT_DB_ALIAS].in_atomic_block)
+        self.assertFalse(can_load_concurrently(DEFAULT_DB_ALIAS))
+
+
+class PermissionMembershipInline(admin.TabularInline):
+    model = Group.permissions.through
+
+
+class GroupConcurrentAdmin(BetterModelAdmin):
+    inlines = [MembershipInline, PermissionMembershipInline]
+    use_concurrent_inlines = True
+    show_inline_workers = 1
+
+    def can_load_show_inlines_concurrently(self, inlines):
+        # The test transaction is shared with the worker below
+        return True
+
+    def load_show_inline_page(self, request, inline, obj, offset=0):
+        # Same in-memory database connection as the test, as in
+        # LiveServerTestCase. It is not closed by the worker
+        connections[DEFAULT_DB_ALIAS] = self.connection
+        page = super(GroupConcurrentAdmin, self).load_show_inline_page(request, inline, obj, offset)
+        self.threads.append(threading.current_thread().name)
+        return page
+
+
+@skipIf(ThreadPoolExecutor is None, 'concurrent.futures is not available')
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ConcurrentInlinesThreadTests(TestCase):
+
+    def test_rows_are_loaded_in_threads(self):
+        site = BetterAdminSite(name='betteradmin_concurrent')
+        site.register(Group, GroupConcurrentAdmin)
+        model_admin = site._registry[Group]
+        model_admin.threads = []
+        model_admin.connection = connections[DEFAULT_DB_ALIAS]
+        model_admin.connection.allow_thread_sharing = True
+        self.addCleanup(setattr, model_admin.connection, 'allow_thread_sharing', False)
+        superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        group = Group.objects.create(name='staff')
+        group.user_set.add(superuser, User.objects.create_user('user'))
+        group.permissions.add(Permission.objects.get(codename='change_group'))
+
+        request = RequestFactory().get('/')
+        request.user = superuser
+        request.resolver_match = ResolverMatch(lambda request: None, (), {}, url_name='auth_group_show')
+        rowsets = model_admin.get_show_inline_rowsets(request, group)
+        self.assertEqual([len(list(rowset)) for rowset in rowsets], [2, 1])
+        self.assertNotIn(threading.current_thread().name, model_admin.threads)
+        self.assertEqual(len(model_admin.threads), 2)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ShowJSONTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.group = Group.objects.create(name='staff')
+        for i in range(3):
+            User.objects.create_user('user%d' % i).groups.add(self.group)
+        self.client.force_login(self.superuser)
+
+    def test_show_json(self):
+        response = self.client.get(reverse('admin:auth_group_show_json', args=(self.group.pk,)))
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(data['fields'], {'name': 'staff', 'permissions': []})
+        inline = data['inlines'][0]
+        self.assertEqual(inline['total_count'], 3)
+        self.assertEqual(len(inline['rows']), 2)
+        self.assertEqual(inline['rows'][0]['user'], 'user0')
+
+        response = self.client.get(inline['rows_url'])
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['user'] for line in lines], ['user0', 'user1', 'user2'])
+
+    def test_deferred_fields_as_urls(self):
+        response = self.client.get(reverse('admin:auth_user_show_json', args=(self.superuser.pk,)))
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(list(data['fields']), ['username', 'date_joined'])
+        self.assertEqual(list(data['deferred_urls']), ['email'])
+
+    def test_permission_denied(self):
+        self.client.force_login(User.objects.create_user('viewer', password='password', is_staff=True))
+        response = self.client.get(reverse('admin:auth_group_show_json', args=(self.group.pk,)))
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(ROOT_URLCONF='betteradmin.tests')
+class ChangeListJoinPlanningTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.superuser)
+
+    def create_entries(self, count):
+        for i in range(count):
+            LogEntry.objects.create(
+                user=self.superuser, content_type=ContentType.objects.get_for_model(Group),
+                object_id=str(i), object_repr='group', action_flag=ADDITION)
+
+    def test_planned_lookups(self):
+        model_admin = site._registry[LogEntry]
+        only, select_related, prefetch_related = model_admin.get_changelist_lookups(
+            ['action_checkbox'] + model_admin.list_display)
+        self.assertEqual(only, ['action_time', 'content_type', 'user'])
+        self.assertEqual(select_related, ['content_type', 'user'])
+        self.assertEqual(prefetch_related, [])
+
+    def test_many_valued_relations_are_prefetched(self):
+        self.assertEqual(get_lookups_plan(LogEntry, ['user__groups__name', 'object_repr']),
+                         (['user', 'object_repr'], ['user'], ['user__groups']))
+
+    def test_queries_do_not_depend_on_rows(self):
+        url = reverse('admin:admin_logentry_changelist')
+        self.create_entries(2)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        self.create_entries(5)
+        with CaptureQueriesContext(connection) as more:
+            response = self.client.get(url)
+        self.assertEqual(len(few), len(more))
+        self.assertContains(response, 'admin@example.com', count=7)
+
+    @override_settings(DEBUG=True)
+    def test_query_budget_warning(self):
+        handler = logging.handlers.BufferingHandler(10)
+        logger = logging.getLogger('betteradmin')
+        logger.addHandler(handler)
+        model_admin = site._registry[LogEntry]
+        model_admin.changelist_query_budget = 1
+        try:
+            self.client.get(reverse('admin:admin_logentry_changelist'))
+        finally:
+            model_admin.changelist_query_budget = 20
+            logger.removeHandler(handler)
+        self.assertEqual(len(handler.buffer), 1)
+        self.assertIn('over its budget of 1', handler.buffer[0].getMessage())
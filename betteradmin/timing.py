@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.db import connections
+
+ShowViewTiming = namedtuple('ShowViewTiming', ('name', 'duration', 'queries'))
+
+
+class ShowViewTimer(object):
+    """
+    Records the duration and the SQL queries count of the phases of a show
+    view request. Queries are counted from the connections queries_log,
+    which is filled between start() and stop() even without DEBUG.
+    """
+    enabled = True
+
+    def __init__(self, using=None):
+        self.connections = [connections[alias] for alias in (using or connections)]
+        self.timings = []
+        self._force_debug_cursor = []
+
+    def start(self):
+        for connection in self.connections:
+            self._force_debug_cursor.append(connection.force_debug_cursor)
+            connection.force_debug_cursor = True
+
+    def stop(self):
+        for connection, force_debug_cursor in zip(self.connections, self._force_debug_cursor):
+            connection.force_debug_cursor = force_debug_cursor
+        self._force_debug_cursor = []
+
+    def get_query_count(self):
+        return sum(len(connection.queries_log) for connection in self.connections)
+
+    @contextmanager
+    def phase(self, name):
+        queries = self.get_query_count()
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.timings.append(ShowViewTiming(
+                name, (time.time() - start) * 1000, self.get_query_count() - queries))
+
+
+class NullShowViewTimer(object):
+    """
+    Timer used when timing is disabled, recording nothing.
+    """
+    enabled = False
+    timings = ()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+
+def format_server_timing(timings):
+    """
+    Returns the Server-Timing header value for timings.
+    """
+    return ', '.join(
+        '%s;dur=%.1f;desc="%d queries"' % (timing.name, timing.duration, timing.queries)
+        for timing in timings)